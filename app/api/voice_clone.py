@@ -3,7 +3,9 @@ Voice Cloning API Endpoints
 Handles voice upload and cloning requests
 """
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import Response
 from typing import List
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,10 +30,10 @@ async def clone_voice(
     Returns:
         Voice ID and status
     """
-    from app.services.voice_cloning import VoiceCloningService
+    from app.services.voice_cloning import get_voice_cloning_service
     
     try:
-        service = VoiceCloningService()
+        service = get_voice_cloning_service()
         
         # Read audio samples
         audio_data = []
@@ -40,7 +42,7 @@ async def clone_voice(
             audio_data.append(data)
         
         # Clone voice
-        voice_path = service.clone_voice(
+        voice_path = await service.clone_voice_async(
             audio_samples=audio_data,
             user_id=user_id,
             voice_name=voice_name
@@ -71,10 +73,10 @@ async def list_cloned_voices(user_id: str = None):
     Returns:
         List of cloned voices
     """
-    from app.services.voice_cloning import VoiceCloningService
+    from app.services.voice_cloning import get_voice_cloning_service
     
     try:
-        service = VoiceCloningService()
+        service = get_voice_cloning_service()
         voices = service.list_cloned_voices(user_id=user_id)
         return {"status": "success", "voices": voices}
     
@@ -83,6 +85,28 @@ async def list_cloned_voices(user_id: str = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{voice_id}/preview")
+async def preview_cloned_voice(voice_id: str):
+    """
+    Get a short audio preview of a cloned voice.
+    
+    Args:
+        voice_id: Voice ID to preview
+    
+    Returns:
+        WAV audio
+    """
+    from app.services.voice_cloning import get_voice_cloning_service
+    
+    service = get_voice_cloning_service()
+    # Synthesis on a cache miss runs piper; keep it off the event loop
+    audio = await asyncio.to_thread(service.get_voice_preview, voice_id)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Voice not found")
+    
+    return Response(content=audio, media_type="audio/wav")
+
+
 @router.delete("/{voice_id}")
 async def delete_cloned_voice(voice_id: str):
     """
@@ -94,10 +118,10 @@ async def delete_cloned_voice(voice_id: str):
     Returns:
         Deletion status
     """
-    from app.services.voice_cloning import VoiceCloningService
+    from app.services.voice_cloning import get_voice_cloning_service
     
     try:
-        service = VoiceCloningService()
+        service = get_voice_cloning_service()
         success = service.delete_cloned_voice(voice_id)
         
         if success:
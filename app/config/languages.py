@@ -2,29 +2,54 @@
 Language Configuration
 Supports multiple languages for STT, TTS, and LLM
 """
+import os
 from pathlib import Path
 
 # Get project root
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+WHISPER_MODELS_DIR = PROJECT_ROOT / "whisper.cpp" / "models"
+
+# Quantized whisper.cpp weights (made with whisper.cpp's `quantize` tool, e.g.
+# ggml-base.en-q8_0.bin) are used when present: int8 weights halve memory
+# bandwidth with negligible accuracy loss. Set to "" to always use full precision.
+WHISPER_QUANTIZATION = os.getenv("WHISPER_QUANTIZATION", "q8_0")
+
+
+def whisper_model_path(name: str) -> str:
+    """
+    Get the path of a whisper.cpp model, preferring its quantized variant.
+    
+    Args:
+        name: Model name (e.g., 'base.en', 'base')
+    
+    Returns:
+        Path to ggml-<name>-<quantization>.bin if it exists, else ggml-<name>.bin
+    """
+    if WHISPER_QUANTIZATION:
+        quantized = WHISPER_MODELS_DIR / f"ggml-{name}-{WHISPER_QUANTIZATION}.bin"
+        if quantized.exists():
+            return str(quantized)
+    return str(WHISPER_MODELS_DIR / f"ggml-{name}.bin")
+
 
 # Supported languages configuration
 SUPPORTED_LANGUAGES = {
     "en": {
         "name": "English",
-        "stt_model": str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.en.bin"),
+        "stt_model": whisper_model_path("base.en"),
         "tts_voice": str(PROJECT_ROOT / "voices" / "en_US-lessac-medium.onnx"),
         "code": "en",
     },
     "es": {
         "name": "Spanish",
-        "stt_model": str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.bin"),  # Multilingual model
+        "stt_model": whisper_model_path("base"),  # Multilingual model
         "tts_voice": str(PROJECT_ROOT / "voices" / "en_US-lessac-medium.onnx"),  # Fallback to English if not available
         "code": "es",
     },
     # Add more languages as needed
     # "fr": {
     #     "name": "French",
-    #     "stt_model": str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.bin"),
+    #     "stt_model": whisper_model_path("base"),
     #     "tts_voice": str(PROJECT_ROOT / "voices" / "fr_FR-medium.onnx"),
     #     "code": "fr",
     # },
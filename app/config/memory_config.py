@@ -12,7 +12,7 @@ MEMORY_CONFIG = {
     
     # Message Management
     'max_messages': 10,              # Maximum messages to keep
-    'summarize_threshold': 15,       # Summarize after this many messages
+    'summarize_threshold': 8,        # Summarize after this many messages (must be below max_messages)
     
     # Important Keywords (messages with these are kept longer)
     'important_keywords': [
@@ -3,12 +3,20 @@ import logging
 import re
 import json
 import requests
+from app.services.memory_manager import build_memory_pack
 
 logger = logging.getLogger(__name__)
 
 # Try smaller models first - ordered by size (smallest first)
 MODELS = ["tinyllama", "phi3:mini", "llama3.2:1b", "llama3.2", "phi3"]
 OLLAMA_API_URL = "http://localhost:11434/api/chat"
+# Keep models (and their cached prompt prefix) loaded between turns
+OLLAMA_KEEP_ALIVE = "30m"
+# Generation options shared by the regular and streaming API calls
+LLM_OPTIONS = {
+    "temperature": 0.7,
+    "num_predict": 200,  # Limit response length
+}
 
 
 def get_model_for_query(model_preference: str = None, use_case: str = None, text: str = None) -> str:
@@ -36,7 +44,17 @@ def get_model_for_query(model_preference: str = None, use_case: str = None, text
         return MODELS[1] if len(MODELS) > 1 else MODELS[0]
 
 
-def _clean_response(response: str) -> str:
+def add_rag_context(prompt: str, rag_context: list = None) -> str:
+    """Append knowledge base snippets (up to 3) to the prompt"""
+    if not rag_context:
+        return prompt
+    
+    context_text = "\n\nRelevant context from knowledge base:\n"
+    context_text += "\n".join(f"- {ctx}" for ctx in rag_context[:3])  # Limit to 3 contexts
+    return prompt + context_text
+
+
+def clean_response(response: str) -> str:
     """Clean LLM response to remove repetition and unwanted content"""
     import re
     
@@ -87,10 +105,7 @@ def chat_with_llm(
     selected_model = get_model_for_query(model_preference, use_case, prompt)
     
     # Add RAG context to prompt if available
-    if rag_context and len(rag_context) > 0:
-        context_text = "\n\nRelevant context from knowledge base:\n"
-        context_text += "\n".join(f"- {ctx}" for ctx in rag_context[:3])  # Limit to 3 contexts
-        prompt = prompt + context_text
+    prompt = add_rag_context(prompt, rag_context)
     
     last_error = None
     
@@ -143,14 +158,12 @@ CRITICAL RULES:
             # Add conversation history ONLY if provided (context analyzer determines if needed)
             # Context is only included when question actually references previous conversation
             if conversation_history and len(conversation_history) > 0:
-                # Context analyzer has already determined this is needed
-                # Only include the relevant context (usually just last exchange)
-                for msg in conversation_history:
-                    messages.append({
-                        "role": msg['role'],
-                        "content": msg['content']
-                    })
-                logger.debug(f"Including {len(conversation_history)} context messages")
+                # Context analyzer has already determined this is needed. It goes in
+                # as one deterministic memory block right after the system prompt, so
+                # only the final user message differs from the cached prompt prefix
+                memory_pack, memory_version = build_memory_pack(conversation_history)
+                messages.append({"role": "system", "content": memory_pack})
+                logger.debug(f"Including memory pack {memory_version} ({len(conversation_history)} messages)")
             else:
                 # No context - standalone question
                 logger.debug("No context included - standalone question")
@@ -169,10 +182,8 @@ CRITICAL RULES:
                         "model": model,
                         "messages": messages,
                         "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "num_predict": 200,  # Limit response length
-                        }
+                        "keep_alive": OLLAMA_KEEP_ALIVE,
+                        "options": LLM_OPTIONS
                     },
                     timeout=120
                 )
@@ -183,7 +194,7 @@ CRITICAL RULES:
                     
                     if response:
                         # Clean response to remove any repetition
-                        response = _clean_response(response)
+                        response = clean_response(response)
                         logger.info(f"Successfully got response from {model} via API")
                         return response
                 else:
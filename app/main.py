@@ -2,17 +2,25 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.websockets import WebSocket
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.ws import voice_pipeline
+from app.ws import voice_pipeline, ENABLE_EMOTION_DETECTION, ENABLE_RESPONSE_CACHE
 from app.api import voice_clone
 from app.services.analytics import get_analytics
 from app.services.export import get_export_service
+from app.services.registry import warm_up
 from app.services.user_preferences import get_user_preferences
+from app.services.webhook import get_webhook_service
 from app.middleware.rate_limiter import get_rate_limiter
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 import time
 
 app = FastAPI()
 
+# Worker threads for blocking model calls made via asyncio.to_thread
+# (STT, TTS, LLM, emotion/context analysis)
+EXECUTOR_WORKERS = max(8, (os.cpu_count() or 1) * 2)
+
 # CORS Configuration for Production
 # Update CORS_ORIGINS environment variable with your frontend URLs
 cors_origins = os.getenv(
@@ -31,6 +39,28 @@ app.add_middleware(
 # Include API routers
 app.include_router(voice_clone.router)
 
+# Dedicated thread pool so concurrent sessions' model calls don't starve each other
+@app.on_event("startup")
+async def startup_event():
+    """Install the default executor used by asyncio.to_thread and warm shared services"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="model")
+    )
+    await asyncio.to_thread(
+        warm_up,
+        emotion_detection=ENABLE_EMOTION_DETECTION,
+        response_cache=ENABLE_RESPONSE_CACHE
+    )
+
+# Release shared resources on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared HTTP clients"""
+    from app.services import streaming_llm
+    
+    await get_webhook_service().aclose()
+    await streaming_llm.aclose()
+
 # Phase 4: Model selection endpoint
 @app.get("/api/models")
 async def get_models_endpoint(request: Request):
@@ -23,6 +23,8 @@ class UserSession:
         self.last_activity = datetime.now()
         self.conversation_count = 0
         self.is_active = True
+        # Set once language detection is confident; detection is skipped after that
+        self.language_locked = False
         
         logger.info(f"Created session: {self.session_id} for user: {self.user_id}")
     
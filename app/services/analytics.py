@@ -2,7 +2,11 @@
 Analytics & Monitoring Service
 Tracks usage, performance, errors, and user engagement
 """
+import asyncio
 import logging
+import os
+import tempfile
+import time
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -15,6 +19,9 @@ logger = logging.getLogger(__name__)
 ANALYTICS_DIR = Path(__file__).parent.parent.parent / "analytics"
 ANALYTICS_DIR.mkdir(exist_ok=True)
 
+# Performance entries are queued on the hot path and applied/saved in batches
+FLUSH_INTERVAL_SECONDS = 1.0
+
 
 class AnalyticsService:
     """
@@ -34,6 +41,9 @@ class AnalyticsService:
             'error_log': [],
             'performance_log': []
         }
+        # (operation, duration, session_id, wall-clock time) awaiting the flush worker
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker_task: Optional[asyncio.Task] = None
         self._load_analytics()
         logger.info("Analytics service initialized")
     
@@ -53,13 +63,32 @@ class AnalyticsService:
     
     def _save_analytics(self):
         """Save analytics to storage"""
+        self._write_analytics(self._snapshot())
+    
+    def _snapshot(self) -> Dict:
+        """Copy metrics into a JSON-ready dict (safe to write from another thread)"""
+        data = self.metrics.copy()
+        # Convert set to list for JSON
+        data['active_users'] = list(data['active_users'])
+        data['error_log'] = list(data['error_log'])
+        data['performance_log'] = list(data['performance_log'])
+        return data
+    
+    def _write_analytics(self, data: Dict):
+        """Write a metrics snapshot to storage"""
         analytics_file = ANALYTICS_DIR / "analytics.json"
         try:
-            # Convert set to list for JSON
-            data = self.metrics.copy()
-            data['active_users'] = list(data['active_users'])
-            with open(analytics_file, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            # Saves run both on the event loop and in the flush worker's thread:
+            # write to a unique temp file then swap it in, so overlapping writes
+            # never leave a truncated or interleaved file
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=ANALYTICS_DIR)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f, indent=2, default=str)
+                os.replace(tmp_path, analytics_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
         except Exception as e:
             logger.warning(f"Failed to save analytics: {e}")
     
@@ -127,9 +156,28 @@ class AnalyticsService:
         duration: float,
         session_id: Optional[str] = None
     ):
-        """Track performance metrics"""
+        """
+        Track performance metrics.
+        Inside the event loop this only queues the entry; the flush worker
+        applies queued entries and saves once per FLUSH_INTERVAL_SECONDS.
+        """
+        entry = (operation, duration, session_id, time.time())
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): apply and save right away
+            self._add_performance(*entry)
+            self._save_analytics()
+            return
+        
+        self.queue.put_nowait(entry)
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = loop.create_task(self._flush_worker())
+    
+    def _add_performance(self, operation: str, duration: float, session_id: Optional[str], timestamp: float):
+        """Append one entry to the performance log"""
         perf_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
             'operation': operation,
             'duration': duration,
             'session_id': session_id
@@ -140,9 +188,27 @@ class AnalyticsService:
         if len(self.metrics['performance_log']) > 100:
             self.metrics['performance_log'] = self.metrics['performance_log'][-100:]
         
-        self._save_analytics()
         logger.debug(f"Tracked performance: {operation} - {duration:.2f}s")
     
+    async def _flush_worker(self):
+        """Apply queued performance entries in batches and save them off the event loop"""
+        while True:
+            batch = [await self.queue.get()]
+            # Let entries from the next second accumulate into the same write
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            for entry in batch:
+                self._add_performance(*entry)
+            try:
+                await asyncio.to_thread(self._write_analytics, self._snapshot())
+            except Exception as e:
+                logger.warning(f"Analytics flush failed: {e}")
+    
     def get_stats(self) -> Dict:
         """Get analytics statistics"""
         return {
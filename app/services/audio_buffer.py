@@ -3,13 +3,118 @@ Audio Buffer Service
 Manages in-memory audio buffering for real-time processing
 """
 import io
+import os
+import shutil
 import struct
+import subprocess
+import tempfile
 import logging
 from typing import Optional
+from app.utils import TEMP_DIR
 
 logger = logging.getLogger(__name__)
 
 
+WAV_HEADER_SIZE = 44
+
+# Seconds ffmpeg may take to decode one recording
+CONVERT_TIMEOUT = 30
+
+
+def detect_container(data) -> Optional[str]:
+    """
+    Identify a complete audio file from its leading bytes.
+    Bare MP3 frames aren't detected: their sync word also occurs in raw PCM.
+    
+    Args:
+        data: Start of a received audio message (bytes-like)
+    
+    Returns:
+        'wav', 'mp4' (e.g. .m4a), 'ogg', 'webm', 'flac' or 'mp3', or None for raw PCM
+    """
+    head = bytes(data[:12])
+    if head[:4] == b'RIFF':
+        return 'wav'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[:4] == b'\x1aE\xdf\xa3':
+        return 'webm'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    return None
+
+
+def convert_to_wav(data: bytes, sample_rate: int = 16000) -> bytes:
+    """
+    Decode a compressed recording to 16-bit mono WAV with ffmpeg.
+    Input and output go through temp files: MP4 files often keep their index
+    at the end (so can't be decoded from a pipe), and WAV written to a pipe
+    has no valid size fields.
+    
+    Args:
+        data: Complete audio file (any format ffmpeg reads)
+        sample_rate: Output sample rate (Hz)
+    
+    Returns:
+        WAV bytes
+    
+    Raises:
+        RuntimeError: If ffmpeg is not installed or can't decode the audio
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required to decode compressed audio")
+    
+    with tempfile.NamedTemporaryFile(dir=TEMP_DIR) as src:
+        src.write(data)
+        src.flush()
+        wav_path = src.name + ".wav"
+        try:
+            result = subprocess.run(
+                [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y", "-i", src.name,
+                 "-ac", "1", "-ar", str(sample_rate), "-c:a", "pcm_s16le", wav_path],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=CONVERT_TIMEOUT,
+                check=False
+            )
+            if result.returncode != 0 or not os.path.exists(wav_path):
+                error_msg = result.stderr.decode('utf-8', errors='ignore').strip()
+                raise RuntimeError(f"ffmpeg could not decode audio: {error_msg}")
+            with open(wav_path, "rb") as wav_file:
+                return wav_file.read()
+        finally:
+            if os.path.exists(wav_path):
+                os.unlink(wav_path)
+
+
+def write_wav_header(buf: bytearray, sample_rate: int = 16000, channels: int = 1, sample_width: int = 2):
+    """
+    Fill in the WAV header at the start of a buffer in place.
+    The buffer must begin with WAV_HEADER_SIZE reserved bytes followed by
+    raw PCM, so the whole buffer becomes a WAV file without copying the audio.
+    
+    Args:
+        buf: Buffer with reserved header space followed by PCM data
+        sample_rate: Audio sample rate (Hz)
+        channels: Number of channels
+        sample_width: Bytes per sample
+    """
+    data_size = len(buf) - WAV_HEADER_SIZE
+    struct.pack_into(
+        '<4sI4s4sIHHIIHH4sI', buf, 0,
+        b'RIFF', data_size + 36, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * sample_width,
+        channels * sample_width, sample_width * 8,
+        b'data', data_size
+    )
+
+
 class AudioBuffer:
     """
     In-memory audio buffer for real-time processing.
@@ -0,0 +1,157 @@
+"""
+Inference Batcher
+Coalesces STT/TTS requests from concurrent sessions in front of the
+blocking whisper/piper calls
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from app.services.fast_stt import speech_to_text_fast, speech_to_text_detect
+from app.services.fast_tts import text_to_speech_fast
+
+logger = logging.getLogger(__name__)
+
+# Batch settings
+MAX_BATCH = 16                                 # Requests collected per batch window
+MAX_WAIT_MS = 20                               # How long to wait for more requests
+MAX_PARALLEL = max(2, (os.cpu_count() or 2) // 2)  # Concurrent model processes
+
+
+class InferenceBatcher:
+    """
+    Process-wide queue in front of a blocking inference function.
+    Requests arriving within MAX_WAIT_MS (up to MAX_BATCH) form one batch.
+    With dedupe, identical requests in a batch share a single call (e.g. the
+    same sentence synthesized for several sessions). Calls run in worker
+    threads, at most max_parallel at a time, so concurrent sessions don't
+    oversubscribe the CPU/GPU with one model process each. Without dedupe
+    and with max_wait_ms=0 there is nothing to coalesce, so calls skip the
+    queue and are only bounded by the semaphore.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        dedupe: bool = False,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: int = MAX_WAIT_MS,
+        max_parallel: int = MAX_PARALLEL
+    ):
+        self.name = name
+        self.fn = fn
+        self.dedupe = dedupe
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._worker: Optional[asyncio.Task] = None
+        self._calls: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.requests = 0
+        self.deduplicated = 0
+    
+    async def submit(self, *args, **kwargs) -> Any:
+        """Queue a call and wait for its result"""
+        if not self.dedupe and not self.max_wait:
+            self.requests += 1
+            async with self._semaphore:
+                return await asyncio.to_thread(self.fn, *args, **kwargs)
+        
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((args, kwargs, future))
+        
+        # Worker exits when the queue drains; restart it on demand
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        
+        return await future
+    
+    async def _run(self):
+        """Collect batches from the queue and dispatch them until it is empty"""
+        loop = asyncio.get_running_loop()
+        
+        while not self.queue.empty():
+            batch = [self.queue.get_nowait()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[tuple, dict, asyncio.Future]]):
+        """Group a batch by call arguments and start one task per group"""
+        groups: Dict[Any, Tuple[tuple, dict, List[asyncio.Future]]] = {}
+        for args, kwargs, future in batch:
+            key = (args, tuple(sorted(kwargs.items()))) if self.dedupe else id(future)
+            if key in groups:
+                groups[key][2].append(future)
+                self.deduplicated += 1
+            else:
+                groups[key] = (args, kwargs, [future])
+        
+        self.batches += 1
+        self.requests += len(batch)
+        logger.debug(f"{self.name} batch: {len(batch)} requests, {len(groups)} calls")
+        
+        # Calls are not awaited here so the next batch can be collected
+        # while this one is still running
+        for args, kwargs, futures in groups.values():
+            task = asyncio.create_task(self._call(args, kwargs, futures))
+            self._calls.add(task)
+            task.add_done_callback(self._calls.discard)
+    
+    async def _call(self, args: tuple, kwargs: dict, futures: List[asyncio.Future]):
+        """Run one call in a worker thread and resolve every waiting future"""
+        async with self._semaphore:
+            try:
+                result = await asyncio.to_thread(self.fn, *args, **kwargs)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+    
+    def get_stats(self) -> dict:
+        """Get batching statistics"""
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'deduplicated': self.deduplicated,
+            'queued': self.queue.qsize(),
+            'in_flight': len(self._calls)
+        }
+
+
+# Global batcher instances (shared by all WebSocket sessions)
+# STT requests are never identical, so they only share the concurrency limit
+_stt_batcher = InferenceBatcher("stt", speech_to_text_fast, max_wait_ms=0)
+_stt_detect_batcher = InferenceBatcher("stt_detect", speech_to_text_detect, max_wait_ms=0)
+_tts_batcher = InferenceBatcher("tts", text_to_speech_fast, dedupe=True)
+
+
+def get_stt_batcher() -> InferenceBatcher:
+    """Get global STT batcher instance"""
+    return _stt_batcher
+
+
+def get_stt_detect_batcher() -> InferenceBatcher:
+    """Get global STT batcher for transcription with language detection"""
+    return _stt_detect_batcher
+
+
+def get_tts_batcher() -> InferenceBatcher:
+    """Get global TTS batcher instance"""
+    return _tts_batcher
@@ -8,6 +8,17 @@ from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Words of 4+ letters are topic candidates
+_TOPIC_WORD_RE = re.compile(r'\b[a-z]{4,}\b')
+
+_COMMON_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'can', 'could', 'should', 'may', 'might', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+_QUESTION_COMMON_WORDS = _COMMON_WORDS | {'what', 'where', 'when', 'who', 'how', 'why'}
+
 
 class ContextAnalyzer:
     """
@@ -39,6 +50,8 @@ class ContextAnalyzer:
             r'^define\s+',            # "Define recursion"
             r'^describe\s+',         # "Describe the process"
         ]
+        # Single alternation so a question is matched in one pass
+        self._standalone_re = re.compile('|'.join(self.standalone_patterns), re.IGNORECASE)
         
         logger.info("Context analyzer initialized")
     
@@ -90,13 +103,7 @@ class ContextAnalyzer:
     
     def _is_standalone_question(self, question: str) -> bool:
         """Check if question is standalone (doesn't need context)"""
-        question_lower = question.lower()
-        
-        # Check standalone patterns
-        for pattern in self.standalone_patterns:
-            if re.match(pattern, question_lower, re.IGNORECASE):
-                return True
-        return False
+        return self._standalone_re.match(question.lower()) is not None
     
     def _references_previous(self, question: str, history: List[Dict]) -> bool:
         """Check if question references previous conversation"""
@@ -147,31 +154,21 @@ class ContextAnalyzer:
     def _extract_topics(self, messages: List[Dict]) -> List[str]:
         """Extract key topics from messages (simple keyword extraction)"""
         topics = []
-        common_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 
-                       'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-                       'can', 'could', 'should', 'may', 'might', 'this', 'that',
-                       'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'}
         
         for msg in messages:
             content = msg.get('content', '').lower()
             # Extract significant words (nouns, important terms)
-            words = re.findall(r'\b[a-z]{4,}\b', content)
+            words = _TOPIC_WORD_RE.findall(content)
             # Filter out common words
-            significant = [w for w in words if w not in common_words]
+            significant = [w for w in words if w not in _COMMON_WORDS]
             topics.extend(significant[:5])  # Top 5 words per message
         
         return topics
     
     def _extract_topics_from_text(self, text: str) -> List[str]:
         """Extract topics from a single text"""
-        common_words = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                       'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-                       'can', 'could', 'should', 'may', 'might', 'this', 'that',
-                       'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
-                       'what', 'where', 'when', 'who', 'how', 'why'}
-        
-        words = re.findall(r'\b[a-z]{4,}\b', text.lower())
-        significant = [w for w in words if w not in common_words]
+        words = _TOPIC_WORD_RE.findall(text.lower())
+        significant = [w for w in words if w not in _QUESTION_COMMON_WORDS]
         return significant[:5]
     
     def get_relevant_context(self, current_question: str, conversation_history: List[Dict], max_messages: int = 2) -> Optional[List[Dict]]:
@@ -195,3 +192,14 @@ class ContextAnalyzer:
         else:
             return conversation_history
 
+
+# Global context analyzer instance (stateless, shared across sessions)
+_context_analyzer: Optional[ContextAnalyzer] = None
+
+
+def get_context_analyzer() -> ContextAnalyzer:
+    """Get global context analyzer instance (created on first use)"""
+    global _context_analyzer
+    if _context_analyzer is None:
+        _context_analyzer = ContextAnalyzer()
+    return _context_analyzer
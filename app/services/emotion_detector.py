@@ -40,6 +40,10 @@ class EmotionDetector:
             r'\b(problem|issue|error|wrong|broken|failed)\b'
         ]
         
+        # Compiled once; detection runs on every turn
+        self._positive_res = [re.compile(p, re.IGNORECASE) for p in self.positive_patterns]
+        self._negative_res = [re.compile(p, re.IGNORECASE) for p in self.negative_patterns]
+        
         logger.info("Emotion detector initialized")
     
     def detect_emotion_from_text(self, text: str) -> Dict[str, any]:
@@ -62,8 +66,8 @@ class EmotionDetector:
                 emotion_scores[emotion] = score
         
         # Detect sentiment
-        positive_count = sum(1 for pattern in self.positive_patterns if re.search(pattern, text_lower, re.IGNORECASE))
-        negative_count = sum(1 for pattern in self.negative_patterns if re.search(pattern, text_lower, re.IGNORECASE))
+        positive_count = sum(1 for pattern in self._positive_res if pattern.search(text_lower))
+        negative_count = sum(1 for pattern in self._negative_res if pattern.search(text_lower))
         
         # Determine primary emotion
         if emotion_scores:
@@ -218,8 +222,7 @@ class SentimentAnalyzer:
         Returns:
             Sentiment analysis result
         """
-        detector = EmotionDetector()
-        result = detector.detect_emotion_from_text(text)
+        result = get_emotion_detector().detect_emotion_from_text(text)
         
         return {
             'sentiment': result['sentiment'],
@@ -227,3 +230,14 @@ class SentimentAnalyzer:
             'emotion': result['emotion']
         }
 
+
+# Global emotion detector instance (stateless, shared across sessions)
+_emotion_detector: Optional[EmotionDetector] = None
+
+
+def get_emotion_detector() -> EmotionDetector:
+    """Get global emotion detector instance (created on first use)"""
+    global _emotion_detector
+    if _emotion_detector is None:
+        _emotion_detector = EmotionDetector()
+    return _emotion_detector
@@ -7,15 +7,17 @@ import tempfile
 import os
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import io
+from app.config.languages import whisper_model_path
+from app.utils import TEMP_DIR
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 WHISPER_PATH = str(PROJECT_ROOT / "whisper.cpp" / "build" / "bin" / "whisper-cli")
-DEFAULT_MODEL = str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.en.bin")
-MULTILINGUAL_MODEL = str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.bin")
+DEFAULT_MODEL = whisper_model_path("base.en")
+MULTILINGUAL_MODEL = whisper_model_path("base")
 
 
 def speech_to_text_fast(audio_bytes: bytes, language: str = "en", use_stdin: bool = True) -> str:
@@ -23,7 +25,8 @@ def speech_to_text_fast(audio_bytes: bytes, language: str = "en", use_stdin: boo
     Fast speech-to-text with minimal file I/O.
     
     Args:
-        audio_bytes: Audio data in WAV format (in memory)
+        audio_bytes: Audio data in WAV format (in memory; any bytes-like
+            object such as a memoryview is accepted, avoiding a copy)
         language: Language code
         use_stdin: Try to use stdin instead of temp file (faster)
     
@@ -55,6 +58,61 @@ def speech_to_text_fast(audio_bytes: bytes, language: str = "en", use_stdin: boo
     return _process_via_temp_file(audio_bytes, model_path, language)
 
 
+def speech_to_text_detect(audio_bytes: bytes, use_stdin: bool = True) -> Tuple[str, Optional[Tuple[str, float]]]:
+    """
+    Transcribe with whisper's language auto-detection, in a single pass
+    (multilingual model).
+    
+    Args:
+        audio_bytes: Audio data in WAV format
+        use_stdin: Try to use stdin instead of temp file (faster)
+    
+    Returns:
+        (text, (language code, probability)) - the language is None if
+        whisper didn't report one
+    """
+    from app.services.language_detector import parse_detected_language
+    
+    if not os.path.exists(WHISPER_PATH):
+        raise FileNotFoundError(f"Whisper CLI not found at: {WHISPER_PATH}")
+    if not os.path.exists(MULTILINGUAL_MODEL):
+        raise FileNotFoundError(f"Multilingual Whisper model not found at: {MULTILINGUAL_MODEL}")
+    
+    # The transcript is printed to stdout; the detected language is logged on stderr
+    cmd = [WHISPER_PATH, "-m", MULTILINGUAL_MODEL, "--no-timestamps", "--language", "auto", "-f"]
+    result = None
+    if use_stdin:
+        result = subprocess.run(
+            cmd + ["-"],
+            input=audio_bytes,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=30,
+            check=False
+        )
+        if result.returncode != 0 or b"failed to read" in result.stderr:
+            result = None
+    
+    if result is None:
+        with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR) as temp_file:
+            temp_file.write(audio_bytes)
+            temp_file.flush()
+            result = subprocess.run(
+                cmd + [temp_file.name],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=30,
+                check=False
+            )
+    
+    if result.returncode != 0:
+        error_msg = result.stderr.decode('utf-8', errors='ignore')
+        raise RuntimeError(f"Whisper failed: {error_msg}")
+    
+    text = result.stdout.decode('utf-8', errors='ignore').strip()
+    return text, parse_detected_language(result.stderr)
+
+
 def _process_via_stdin(audio_bytes: bytes, model_path: str, language: str) -> str:
     """
     Process audio via stdin (fastest method, no file I/O).
@@ -101,8 +159,8 @@ def _process_via_temp_file(audio_bytes: bytes, model_path: str, language: str) -
     Process audio via temp file (fallback method).
     Optimized to minimize I/O time.
     """
-    # Use NamedTemporaryFile with delete=False for faster access
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+    # Use NamedTemporaryFile with delete=False for faster access (on tmpfs if available)
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR, delete=False) as temp_file:
         temp_file.write(audio_bytes)
         wav_path = temp_file.name
     
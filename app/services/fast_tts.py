@@ -7,7 +7,10 @@ import tempfile
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 import io
+from app.utils import TEMP_DIR
+from app.services.tts_cache import get_tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +18,12 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 DEFAULT_VOICE = str(PROJECT_ROOT / "voices" / "en_US-lessac-medium.onnx")
 
 
-def text_to_speech_fast(text: str, language: str = "en", use_stdout: bool = True) -> bytes:
+def text_to_speech_fast(
+    text: str,
+    language: str = "en",
+    use_stdout: bool = True,
+    voice: Optional[str] = None
+) -> bytes:
     """
     Fast text-to-speech with minimal file I/O.
     
@@ -23,6 +31,7 @@ def text_to_speech_fast(text: str, language: str = "en", use_stdout: bool = True
         text: Text to convert
         language: Language code
         use_stdout: Try to use stdout instead of temp file (faster)
+        voice: Voice model path (overrides the language's default voice)
     
     Returns:
         Audio data in WAV format
@@ -30,8 +39,11 @@ def text_to_speech_fast(text: str, language: str = "en", use_stdout: bool = True
     from app.config.languages import get_language_config
     
     # Get language-specific voice model
-    lang_config = get_language_config(language)
-    voice_model = lang_config.get('tts_voice', DEFAULT_VOICE)
+    if voice:
+        voice_model = voice
+    else:
+        lang_config = get_language_config(language)
+        voice_model = lang_config.get('tts_voice', DEFAULT_VOICE)
     
     if not os.path.exists(voice_model):
         logger.warning(f"Voice model not found at {voice_model}, using default")
@@ -39,15 +51,26 @@ def text_to_speech_fast(text: str, language: str = "en", use_stdout: bool = True
         if not os.path.exists(voice_model):
             raise FileNotFoundError(f"Voice model not found at: {voice_model}")
     
+    # Repeated phrases (greetings, errors) are served from cache
+    cache = get_tts_cache()
+    cached = cache.get(voice_model, language, text)
+    if cached is not None:
+        return cached
+    
+    audio = None
     # Try stdout first (faster, no file I/O)
     if use_stdout:
         try:
-            return _process_via_stdout(text, voice_model)
+            audio = _process_via_stdout(text, voice_model)
         except Exception as e:
             logger.warning(f"Stdout processing failed: {e}, falling back to temp file")
     
     # Fallback to temp file
-    return _process_via_temp_file(text, voice_model)
+    if audio is None:
+        audio = _process_via_temp_file(text, voice_model)
+    
+    cache.put(voice_model, language, text, audio)
+    return audio
 
 
 def _process_via_stdout(text: str, voice_model: str) -> bytes:
@@ -83,8 +106,8 @@ def _process_via_temp_file(text: str, voice_model: str) -> bytes:
     Process TTS via temp file (fallback method).
     Optimized to minimize I/O time.
     """
-    # Use NamedTemporaryFile with delete=False for faster access
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+    # Use NamedTemporaryFile with delete=False for faster access (on tmpfs if available)
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR, delete=False) as temp_file:
         wav_path = temp_file.name
     
     try:
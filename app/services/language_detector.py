@@ -3,26 +3,53 @@ Language Detection Service
 Auto-detects language from audio or text
 """
 import logging
+import re
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+from app.config.languages import whisper_model_path
+from app.utils import TEMP_DIR
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 WHISPER_PATH = str(PROJECT_ROOT / "whisper.cpp" / "build" / "bin" / "whisper-cli")
-MULTILINGUAL_MODEL = str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.bin")
+MULTILINGUAL_MODEL = whisper_model_path("base")
 
+# whisper.cpp logs e.g. "auto-detected language: es (p = 0.973541)"
+_AUTO_DETECTED_RE = re.compile(rb"auto-detected language: (\w+) \(p = ([0-9.]+)\)")
 
-def detect_language_from_audio(audio_bytes: bytes) -> Optional[str]:
+# Keyword heuristics are much less reliable than whisper's own detection
+TEXT_DETECTION_CONFIDENCE = 0.6
+
+
+def parse_detected_language(whisper_output: bytes) -> Optional[Tuple[str, float]]:
+    """
+    Parse whisper.cpp's language auto-detection log line.
+    
+    Args:
+        whisper_output: whisper-cli stderr (or stdout)
+    
+    Returns:
+        (language code, probability), or None if whisper didn't report one
+    """
+    match = _AUTO_DETECTED_RE.search(whisper_output or b"")
+    if not match:
+        return None
+    return match.group(1).decode(), float(match.group(2))
+
+
+def detect_language_from_audio(audio_bytes: bytes) -> Optional[Tuple[str, float]]:
     """
-    Detect language from audio using Whisper.
+    Detect language from audio using Whisper (detection only - the voice
+    pipeline gets the language from its STT pass instead, see
+    speech_to_text_detect).
     
     Args:
         audio_bytes: Audio data in WAV format
     
     Returns:
-        Language code (e.g., 'en', 'es') or None if detection fails
+        (language code, probability) e.g. ('es', 0.97), or None if detection fails
     """
     import tempfile
     import os
@@ -33,20 +60,19 @@ def detect_language_from_audio(audio_bytes: bytes) -> Optional[str]:
         # Just return None to use default language
         return None
     
-    # Save audio to temp file
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+    # Save audio to temp file (on tmpfs if available)
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR, delete=False) as temp_file:
         temp_file.write(audio_bytes)
         wav_path = temp_file.name
     
     try:
-        # Run Whisper with language detection
+        # Run Whisper's language detection only (exits before transcribing)
         cmd = [
             WHISPER_PATH,
             "-m", MULTILINGUAL_MODEL,
             "-f", wav_path,
-            "--language", "auto",  # Auto-detect language
-            "--no-timestamps",
-            "-otxt"
+            "--language", "auto",
+            "--detect-language"
         ]
         
         result = subprocess.run(
@@ -56,14 +82,12 @@ def detect_language_from_audio(audio_bytes: bytes) -> Optional[str]:
             timeout=30
         )
         
-        # Parse language from output (if available)
-        # Note: Whisper CLI may not directly output language code
-        # This is a simplified implementation
+        # Parse the detected language and its probability from whisper's log
         if result.returncode == 0:
-            # For now, return None and let the system use default
-            # In production, you'd parse the actual language from Whisper output
-            logger.info("Language detection completed (using default for now)")
-            return None  # Will use default language
+            detected = parse_detected_language(result.stderr) or parse_detected_language(result.stdout)
+            if detected:
+                logger.info(f"Language detected from audio: {detected[0]} (p = {detected[1]:.2f})")
+                return detected
         
         return None
     except Exception as e:
@@ -95,7 +119,7 @@ def detect_language_from_text(text: str) -> Optional[str]:
     return "en"
 
 
-def detect_language(audio_bytes: bytes = None, text: str = None) -> str:
+def detect_language(audio_bytes: bytes = None, text: str = None) -> Tuple[str, float]:
     """
     Detect language from audio or text.
     
@@ -104,16 +128,16 @@ def detect_language(audio_bytes: bytes = None, text: str = None) -> str:
         text: Text data (optional)
     
     Returns:
-        Language code (defaults to 'en')
+        (language code, confidence) - falls back to ('en', 0.0)
     """
     from app.config.languages import FALLBACK_LANGUAGE
     
     # Try audio detection first (silently fails if models not available)
     if audio_bytes:
         try:
-            lang = detect_language_from_audio(audio_bytes)
-            if lang:
-                return lang
+            detected = detect_language_from_audio(audio_bytes)
+            if detected:
+                return detected
         except Exception:
             # Silently fail and continue to text detection or fallback
             pass
@@ -123,11 +147,11 @@ def detect_language(audio_bytes: bytes = None, text: str = None) -> str:
         try:
             lang = detect_language_from_text(text)
             if lang:
-                return lang
+                return lang, TEXT_DETECTION_CONFIDENCE
         except Exception:
             # Silently fail and use fallback
             pass
     
     # Fallback to default
-    return FALLBACK_LANGUAGE
+    return FALLBACK_LANGUAGE, 0.0
 
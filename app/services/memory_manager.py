@@ -2,8 +2,10 @@
 Memory Management System for LLM Conversations
 Handles conversation history, summarization, and context management
 """
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -21,12 +23,15 @@ class ConversationMemory:
     - Smart message selection
     """
     
+    KEEP_RECENT = 4  # Messages kept verbatim when summarizing (2 exchanges)
+    
     def __init__(
         self,
         max_tokens: int = 2000,
         max_messages: int = 10,
         summarize_threshold: int = 15,
-        important_keywords: List[str] = None
+        important_keywords: List[str] = None,
+        defer_summarization: bool = False
     ):
         """
         Initialize memory manager.
@@ -36,6 +41,8 @@ class ConversationMemory:
             max_messages: Maximum number of messages to keep
             summarize_threshold: Number of messages before summarizing
             important_keywords: Keywords that mark messages as important
+            defer_summarization: Leave summarization to summarize_async() instead
+                of running it inside add_message()
         """
         self.max_tokens = max_tokens
         self.max_messages = max_messages
@@ -47,6 +54,15 @@ class ConversationMemory:
         self.messages: List[Dict] = []
         self.summary: Optional[str] = None
         self.total_tokens = 0
+        self.defer_summarization = defer_summarization
+        self._summarize_lock = asyncio.Lock()
+        
+        if summarize_threshold >= max_messages:
+            # Trimming keeps the list at max_messages, so summarization would never run
+            logger.warning(
+                f"summarize_threshold ({summarize_threshold}) >= max_messages ({max_messages}): "
+                "old messages will be trimmed, never summarized"
+            )
         
         logger.info(f"Memory manager initialized: max_tokens={max_tokens}, max_messages={max_messages}")
     
@@ -83,7 +99,7 @@ class ConversationMemory:
     def _manage_memory(self) -> None:
         """Automatically manage memory when limits are exceeded"""
         # Check if we need to summarize
-        if len(self.messages) > self.summarize_threshold:
+        if self.needs_summary() and not self.defer_summarization:
             self._summarize_old_messages()
         
         # Check token limit
@@ -94,21 +110,50 @@ class ConversationMemory:
         if len(self.messages) > self.max_messages:
             self._trim_messages()
     
+    def needs_summary(self) -> bool:
+        """Check if the message count has crossed the summarize threshold"""
+        return len(self.messages) > self.summarize_threshold
+    
     def _summarize_old_messages(self) -> None:
         """Summarize old messages to save tokens"""
         if len(self.messages) <= 2:
             return
         
         # Keep recent messages, summarize older ones
-        keep_recent = 4  # Keep last 4 messages (2 exchanges)
-        to_summarize = self.messages[:-keep_recent]
-        recent = self.messages[-keep_recent:]
-        
+        to_summarize = self.messages[:-self.KEEP_RECENT]
         if not to_summarize:
             return
         
         # Create summary of old messages
-        summary_text = self._create_summary(to_summarize)
+        self._apply_summary(len(to_summarize), self._create_summary(to_summarize))
+    
+    async def summarize_async(self) -> None:
+        """
+        Summarize old messages between turns (for deferred summarization).
+        The summary is built in a worker thread from a snapshot, then swapped
+        in; messages added meanwhile are kept. Concurrent calls are serialized.
+        """
+        async with self._summarize_lock:
+            if not self.needs_summary():
+                return
+            
+            snapshot = self.messages
+            to_summarize = snapshot[:-self.KEEP_RECENT]
+            if not to_summarize:
+                return
+            
+            summary_text = await asyncio.to_thread(self._create_summary, to_summarize)
+            
+            # Compression/trimming replaced the list while we were summarizing;
+            # the snapshot no longer lines up, so try again after the next turn
+            if self.messages is not snapshot:
+                return
+            
+            self._apply_summary(len(to_summarize), summary_text)
+    
+    def _apply_summary(self, count: int, summary_text: str) -> None:
+        """Replace the first count messages with a summary message"""
+        recent = self.messages[count:]
         
         # Replace old messages with summary
         self.messages = [{
@@ -123,7 +168,7 @@ class ConversationMemory:
         # Recalculate tokens
         self.total_tokens = sum(msg['tokens'] for msg in self.messages)
         
-        logger.info(f"Summarized {len(to_summarize)} messages into summary, kept {len(recent)} recent")
+        logger.info(f"Summarized {count} messages into summary, kept {len(recent)} recent")
     
     def _create_summary(self, messages: List[Dict]) -> str:
         """
@@ -279,3 +324,25 @@ class AdvancedMemoryManager(ConversationMemory):
         # For now, use simple summary
         return super()._create_summary(messages)
 
+
+MEMORY_PACK_VERSION = 1  # Bump when the rendering below changes
+
+
+def build_memory_pack(messages: List[Dict]) -> Tuple[str, str]:
+    """
+    Render context messages as one deterministic block for the LLM prompt.
+    The same messages always produce byte-identical text (no timestamps or
+    metadata), so the model server can reuse its cached prompt prefix.
+    
+    Args:
+        messages: Context messages in conversation order ({'role', 'content'})
+    
+    Returns:
+        (memory pack text, version hash)
+    """
+    lines = [f"Conversation memory (v{MEMORY_PACK_VERSION}):"]
+    for msg in messages:
+        lines.append(f"{msg['role']}: {msg['content'].strip()}")
+    text = "\n".join(lines)
+    version = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+    return text, version
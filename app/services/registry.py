@@ -0,0 +1,33 @@
+"""
+Service Registry
+Creates the process-wide services shared by all WebSocket sessions at
+startup, so the first connection doesn't pay their initialization cost.
+Per-session state (conversation memory, VAD) is still created per connection.
+"""
+import logging
+from app.services.context_analyzer import get_context_analyzer
+from app.services.emotion_detector import get_emotion_detector
+from app.services.voice_cloning import get_voice_cloning_service
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(emotion_detection: bool = True, response_cache: bool = True):
+    """
+    Initialize shared services (blocking - run in a worker thread).
+    
+    Args:
+        emotion_detection: Create the emotion detector
+        response_cache: Create the semantic response cache (may load an embedding model)
+    """
+    get_context_analyzer()
+    get_voice_cloning_service()
+    
+    if emotion_detection:
+        get_emotion_detector()
+    
+    if response_cache:
+        from app.services.response_cache import get_response_cache
+        get_response_cache()
+    
+    logger.info("Shared services initialized")
@@ -0,0 +1,216 @@
+"""
+Semantic Response Cache
+Reuses replies (and their synthesized audio) for repeated questions asked
+with the same conversation context by the same user
+"""
+import hashlib
+import logging
+import re
+import threading
+from time import time as _now
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # Optional - without it only exact repeats are cached
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+# Cache settings
+MAX_ENTRIES = 10_000          # Ring buffer size (oldest entries are overwritten)
+MAX_AUDIO_BYTES = 256 * 1024 * 1024  # Total cached audio; oldest entries are evicted past this
+SIMILARITY_THRESHOLD = 0.93   # Minimum cosine similarity for a semantic hit
+ENTRY_TTL_SECONDS = 3600      # Replies can go stale (dates, news), so expire them
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_NORMALIZE_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# (normalized question, unit embedding or None without an embedding model)
+CacheKey = Tuple[str, Optional[np.ndarray]]
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip punctuation and repeated whitespace"""
+    return _SPACE_RE.sub(" ", _NORMALIZE_RE.sub(" ", text.lower())).strip()
+
+
+class ResponseCache:
+    """
+    Cache of LLM replies keyed by question and context fingerprint.
+    Exact repeats of a normalized question always hit. With an embedding model,
+    similar questions also hit: vectors are kept in a preallocated matrix and
+    searched with a single matrix-vector product. Surface similarity alone
+    can't tell "is the water safe" from "is the water not safe", so without a
+    model there is no fuzzy matching.
+    A hit also requires the same context fingerprint, so follow-up questions
+    are never answered from a different conversation state or user.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_audio_bytes: int = MAX_AUDIO_BYTES,
+        use_embeddings: bool = True
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.max_audio_bytes = max_audio_bytes
+        self._model = None
+        if use_embeddings and SentenceTransformer is not None:
+            try:
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+            except Exception as e:
+                logger.warning(f"Embedding model unavailable, caching exact repeats only: {e}")
+        
+        self._vectors = None
+        if self._model is not None:
+            dim = self._model.get_sentence_embedding_dimension()
+            self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._fingerprints = np.zeros(max_entries, dtype=np.int64)
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        # slot -> (normalized question, reply, audio chunks)
+        self._entries: List[Optional[Tuple[str, str, List[bytes]]]] = [None] * max_entries
+        # (fingerprint, normalized question) -> slot
+        self._exact: Dict[Tuple[int, str], int] = {}
+        self._audio_bytes = 0
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Response cache initialized ({'sentence-transformers' if self._model else 'exact match only'})")
+    
+    def make_key(self, text: str) -> CacheKey:
+        """Normalize a question and embed it as a unit vector (if a model is loaded)"""
+        normalized = normalize(text)
+        if self._model is None:
+            return normalized, None
+        vector = self._model.encode(normalized, normalize_embeddings=True)
+        return normalized, np.asarray(vector, dtype=np.float32)
+    
+    @staticmethod
+    def fingerprint(
+        context: Optional[List[Dict]],
+        language: str,
+        prompt_suffix: str = "",
+        rag_context: Optional[List[str]] = None,
+        scope: str = ""
+    ) -> int:
+        """
+        Hash everything besides the question that shapes the reply.
+        
+        Args:
+            context: Conversation history sent to the LLM
+            language: Reply language
+            prompt_suffix: Extra prompt text (e.g. emotion context)
+            rag_context: Retrieved documents
+            scope: Owner of the reply (e.g. user ID) - entries never cross scopes
+        
+        Returns:
+            Signed 64-bit fingerprint
+        """
+        h = hashlib.blake2b(digest_size=8)
+        h.update(scope.encode("utf-8"))
+        h.update(b"\0" + language.encode("utf-8"))
+        h.update(b"\0" + prompt_suffix.encode("utf-8"))
+        for msg in context or []:
+            h.update(f"\0{msg.get('role')}\0{msg.get('content')}".encode("utf-8"))
+        for item in rag_context or []:
+            h.update(b"\1" + str(item).encode("utf-8"))
+        return int.from_bytes(h.digest(), "little", signed=True)
+    
+    def lookup(self, key: CacheKey, fingerprint: int) -> Optional[Tuple[str, List[bytes]]]:
+        """
+        Find a cached reply for the same (or, with a model, a similar) question
+        with the same fingerprint.
+        
+        Returns:
+            (reply, audio chunks), or None on a miss
+        """
+        normalized, query = key
+        cutoff = _now() - ENTRY_TTL_SECONDS
+        with self._lock:
+            slot = self._exact.get((fingerprint, normalized))
+            if slot is not None and self._created[slot] > cutoff:
+                self.hits += 1
+                return self._entries[slot][1:]
+            
+            n = self._count
+            if n and query is not None and self._vectors is not None:
+                scores = self._vectors[:n] @ query
+                valid = (self._fingerprints[:n] == fingerprint) & (self._created[:n] > cutoff)
+                scores = np.where(valid, scores, -1.0)
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self._entries[best][1:]
+            self.misses += 1
+        return None
+    
+    def store(self, key: CacheKey, fingerprint: int, reply: str, audio: List[bytes]):
+        """
+        Add a reply and its audio, overwriting the oldest entry if full.
+        Replies with any missing audio chunk are not cached.
+        """
+        size = sum(len(chunk) for chunk in audio)
+        if not reply or not audio or not all(audio) or size > self.max_audio_bytes:
+            return
+        
+        normalized, query = key
+        with self._lock:
+            old = self._exact.get((fingerprint, normalized))
+            if old is not None:
+                self._evict(old)
+            
+            slot = self._next
+            self._evict(slot)
+            # Make room in the audio budget, oldest entries first
+            victim = (slot + 1) % self.max_entries
+            while self._audio_bytes + size > self.max_audio_bytes:
+                self._evict(victim)
+                victim = (victim + 1) % self.max_entries
+            
+            if self._vectors is not None and query is not None:
+                self._vectors[slot] = query
+            self._fingerprints[slot] = fingerprint
+            self._created[slot] = _now()
+            self._entries[slot] = (normalized, reply, audio)
+            self._exact[(fingerprint, normalized)] = slot
+            self._audio_bytes += size
+            self._next = (slot + 1) % self.max_entries
+            self._count = min(self._count + 1, self.max_entries)
+    
+    def _evict(self, slot: int):
+        """Drop the entry in a slot, if any (call with _lock held)"""
+        entry = self._entries[slot]
+        if entry is None:
+            return
+        self._exact.pop((int(self._fingerprints[slot]), entry[0]), None)
+        self._audio_bytes -= sum(len(chunk) for chunk in entry[2])
+        self._entries[slot] = None
+        self._created[slot] = 0.0
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        return {
+            'entries': len(self._exact),
+            'audio_bytes': self._audio_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Global response cache instance (shared across sessions)
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get global response cache instance (created on first use)"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
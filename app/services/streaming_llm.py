@@ -2,12 +2,13 @@
 Streaming LLM Service
 Streams LLM responses word-by-word for better UX
 """
-import subprocess
+import asyncio
 import logging
-import re
-import requests
 import json
+import httpx
 from typing import AsyncGenerator
+from app.llm import LLM_OPTIONS, OLLAMA_KEEP_ALIVE, add_rag_context
+from app.services.memory_manager import build_memory_pack
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +16,26 @@ logger = logging.getLogger(__name__)
 MODELS = ["tinyllama", "phi3:mini", "llama3.2:1b", "llama3.2", "phi3"]
 OLLAMA_API_URL = "http://localhost:11434/api/chat"
 
+# Async client so reading the stream never blocks the event loop
+_client = httpx.AsyncClient(timeout=httpx.Timeout(120.0))
+
 
 async def stream_llm_response(
     prompt: str,
     conversation_history: list = None,
-    model: str = None
+    model: str = None,
+    rag_context: list = None
 ) -> AsyncGenerator[str, None]:
     """
     Stream LLM response word-by-word.
+    Uses the same generation options as chat_with_llm; callers should run
+    clean_response() on the assembled reply.
     
     Args:
         prompt: User's question
         conversation_history: Previous conversation (optional)
         model: Specific model to use (optional)
+        rag_context: RAG context from knowledge base (optional)
     
     Yields:
         Text chunks as they're generated
@@ -53,18 +61,16 @@ CRITICAL RULES:
 5. If the user asks about something, answer that specific thing - nothing else"""
     })
     
-    # Add conversation history if provided
+    # Add conversation history if provided (one deterministic block, so the
+    # prompt prefix stays cacheable)
     if conversation_history:
-        for msg in conversation_history:
-            messages.append({
-                "role": msg['role'],
-                "content": msg['content']
-            })
+        memory_pack, _ = build_memory_pack(conversation_history)
+        messages.append({"role": "system", "content": memory_pack})
     
-    # Add current question
+    # Add current question (with knowledge base context, if any)
     messages.append({
         "role": "user",
-        "content": prompt
+        "content": add_rag_context(prompt, rag_context)
     })
     
     # Try streaming with Ollama API
@@ -75,24 +81,24 @@ CRITICAL RULES:
             logger.info(f"Trying streaming with model: {model_name}")
             
             # Stream from Ollama API
-            response = requests.post(
+            buffer = ""
+            async with _client.stream(
+                "POST",
                 OLLAMA_API_URL,
                 json={
                     "model": model_name,
                     "messages": messages,
                     "stream": True,  # Enable streaming
-                    "options": {
-                        "temperature": 0.7,
-                    }
-                },
-                stream=True,
-                timeout=120
-            )
-            
-            if response.status_code == 200:
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
+                    "options": LLM_OPTIONS
+                }
+            ) as response:
+                if response.status_code != 200:
+                    logger.warning(f"Streaming API failed with status {response.status_code}, trying next model")
+                    continue
+                
                 # Stream the response
-                buffer = ""
-                for line in response.iter_lines():
+                async for line in response.aiter_lines():
                     if line:
                         try:
                             chunk_data = json.loads(line)
@@ -108,21 +114,28 @@ CRITICAL RULES:
                                     break
                         except json.JSONDecodeError:
                             continue
+            
+            if buffer:
+                logger.info(f"Streamed response from {model_name}: {len(buffer)} chars")
+                return
                 
-                if buffer:
-                    logger.info(f"Streamed response from {model_name}: {len(buffer)} chars")
-                    return
-            else:
-                logger.warning(f"Streaming API failed with status {response.status_code}, trying next model")
-                continue
-                
-        except (requests.exceptions.RequestException, KeyError) as e:
+        except (httpx.HTTPError, KeyError) as e:
             logger.info(f"Streaming API not available or failed: {e}, trying next model")
             continue
     
     # Fallback: Return full response (non-streaming)
     logger.warning("Streaming not available, falling back to non-streaming")
     from app.llm import chat_with_llm
-    full_response = chat_with_llm(prompt, conversation_history)
+    full_response = await asyncio.to_thread(
+        chat_with_llm,
+        prompt,
+        conversation_history,
+        model_preference=model,
+        rag_context=rag_context
+    )
     yield full_response
 
+
+async def aclose():
+    """Close the shared streaming HTTP client (call on app shutdown)"""
+    await _client.aclose()
@@ -3,16 +3,53 @@ Tool Executor Service
 Handles execution of tools/functions called by LLM
 """
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from time import time as _now
+from typing import Dict, Any, Optional, List, Callable
 from app.services.tools import (
     execute_tool,
     get_available_tools,
     detect_tool_need,
-    TOOLS
+    TOOL_NAMES
 )
 
 logger = logging.getLogger(__name__)
 
+# Parameter extraction patterns (compiled once)
+_SEARCH_RE = re.compile(r"\b(?:search|find|look up)\s+(.+)$", re.IGNORECASE)
+_WEATHER_RE = re.compile(r"\bweather\s+(?:in\s+|for\s+)?(.+)$", re.IGNORECASE)
+
+
+def _extract_calculator(text: str) -> Dict[str, Any]:
+    """Use the whole utterance as the expression (simplified)"""
+    return {"expression": text}
+
+
+def _extract_time(text: str) -> Dict[str, Any]:
+    """get_current_time takes no parameters"""
+    return {}
+
+
+def _extract_weather(text: str) -> Dict[str, Any]:
+    """Take the location from the words after "weather" (simplified)"""
+    match = _WEATHER_RE.search(text)
+    return {"location": match.group(1).strip() if match else "unknown"}
+
+
+def _extract_search(text: str) -> Dict[str, Any]:
+    """Take the query from the words after a search keyword, else the whole text"""
+    match = _SEARCH_RE.search(text)
+    return {"query": match.group(1).strip() if match else text}
+
+
+# Tool name -> parameter extractor
+_EXTRACTORS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "calculator": _extract_calculator,
+    "get_current_time": _extract_time,
+    "get_weather": _extract_weather,
+    "search_web": _extract_search,
+}
+
 
 class ToolExecutor:
     """
@@ -52,7 +89,7 @@ class ToolExecutor:
             'tool': tool_name,
             'parameters': parameters,
             'success': result.get('success', False),
-            'timestamp': __import__('time').time()
+            'timestamp': _now()
         })
         
         # Keep only last 100 entries
@@ -95,37 +132,8 @@ class ToolExecutor:
         Returns:
             Parameters dictionary
         """
-        parameters = {}
-        
-        if tool_name == "calculator":
-            # Extract expression (simplified)
-            parameters["expression"] = text
-        elif tool_name == "get_current_time":
-            parameters = {}
-        elif tool_name == "get_weather":
-            # Extract location (simplified)
-            words = text.split()
-            if len(words) > 2:
-                # Try to find location after "weather" keyword
-                weather_idx = next((i for i, w in enumerate(words) if "weather" in w.lower()), -1)
-                if weather_idx >= 0 and weather_idx + 1 < len(words):
-                    parameters["location"] = " ".join(words[weather_idx + 1:])
-                else:
-                    parameters["location"] = "unknown"
-            else:
-                parameters["location"] = "unknown"
-        elif tool_name == "search_web":
-            # Extract query
-            search_keywords = ["search", "find", "look up"]
-            for keyword in search_keywords:
-                if keyword in text.lower():
-                    idx = text.lower().find(keyword)
-                    parameters["query"] = text[idx + len(keyword):].strip()
-                    break
-            if "query" not in parameters:
-                parameters["query"] = text
-        
-        return parameters
+        extractor = _EXTRACTORS.get(tool_name)
+        return extractor(text) if extractor else {}
     
     def get_tool_stats(self) -> Dict[str, Any]:
         """Get statistics about tool usage"""
@@ -135,7 +143,7 @@ class ToolExecutor:
             'enabled': self.enabled,
             'total_executions': len(self.tool_history),
             'tool_usage': dict(tool_counts),
-            'available_tools': list(TOOLS.keys())
+            'available_tools': list(TOOL_NAMES)
         }
 
 
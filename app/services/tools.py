@@ -4,14 +4,16 @@ Functions that the LLM can call (function calling / tool use)
 """
 import logging
 import json
-from typing import Dict, Any, Optional
+from time import time as _now
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
-# Available tools
-TOOLS = {
+# Available tools (read-only - the schema never changes at runtime)
+TOOLS: Mapping[str, Dict] = MappingProxyType({
     "calculator": {
         "name": "calculator",
         "description": "Perform mathematical calculations",
@@ -47,7 +49,13 @@ TOOLS = {
             }
         }
     }
-}
+})
+
+# Tool names in definition order
+TOOL_NAMES = tuple(TOOLS.keys())
+
+# (epoch second, formatted result) for get_current_time
+_TIME_CACHE: Optional[Tuple[int, Dict[str, Any]]] = None
 
 
 def calculator(expression: str) -> Dict[str, Any]:
@@ -90,15 +98,28 @@ def calculator(expression: str) -> Dict[str, Any]:
 
 
 def get_current_time() -> Dict[str, Any]:
-    """Get current date and time"""
-    now = datetime.now()
-    return {
+    """
+    Get current date and time.
+    The formatted result is reused for calls within the same wall-clock second
+    (each caller gets its own copy, so the cached dict is never shared).
+    """
+    global _TIME_CACHE
+    
+    timestamp = _now()
+    second = int(timestamp)
+    if _TIME_CACHE is not None and _TIME_CACHE[0] == second:
+        return dict(_TIME_CACHE[1])
+    
+    now = datetime.fromtimestamp(timestamp)
+    result = {
         "success": True,
         "datetime": now.isoformat(),
         "date": now.strftime("%Y-%m-%d"),
         "time": now.strftime("%H:%M:%S"),
-        "timestamp": now.timestamp()
+        "timestamp": timestamp
     }
+    _TIME_CACHE = (second, result)
+    return dict(result)
 
 
 def get_weather(location: str) -> Dict[str, Any]:
@@ -166,7 +187,7 @@ def execute_tool(tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": f"Unknown tool: {tool_name}",
-            "available_tools": list(TOOL_FUNCTIONS.keys())
+            "available_tools": list(TOOL_NAMES)
         }
     
     try:
@@ -183,9 +204,9 @@ def execute_tool(tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
-def get_available_tools() -> Dict[str, Dict]:
-    """Get all available tools"""
-    return TOOLS.copy()
+def get_available_tools() -> Mapping[str, Dict]:
+    """Get all available tools (read-only view)"""
+    return TOOLS
 
 
 def detect_tool_need(text: str) -> Optional[str]:
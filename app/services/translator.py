@@ -2,10 +2,12 @@
 Real-time Translation Service
 Translates conversations in real-time for cross-language communication
 """
+import asyncio
 import logging
+import re
 import subprocess
 import requests
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,13 @@ logger = logging.getLogger(__name__)
 USE_LLM_TRANSLATION = True  # Use LLM for translation (more accurate)
 FALLBACK_TO_API = False     # Fallback to translation API if LLM fails
 
+# Batching configuration (concurrent requests for the same language pair)
+BATCH_MAX_SIZE = 8          # Maximum texts per batched LLM prompt
+BATCH_MAX_WAIT_MS = 25      # How long to wait for more texts before flushing
+
+# Matches "1) text" / "1. text" / "1: text" lines in batched LLM output
+_NUMBERED_LINE_RE = re.compile(r"^\s*(\d+)\s*[).:-]\s*(.*\S)\s*$")
+
 
 class Translator:
     """
@@ -34,6 +43,7 @@ class Translator:
             'ko': 'Korean',
             'zh': 'Chinese'
         }
+        self._batchers: Dict[Tuple[Optional[str], str], "_TranslationBatcher"] = {}
         logger.info("Translator initialized")
     
     def translate_text(
@@ -75,6 +85,89 @@ class Translator:
         logger.warning(f"Translation failed for: {text[:50]}...")
         return None
     
+    async def translate_text_async(
+        self,
+        text: str,
+        target_language: str,
+        source_language: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Translate text, coalescing concurrent calls for the same language
+        pair into a single batched LLM prompt.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language code (e.g., 'es', 'fr')
+            source_language: Source language code (optional, auto-detect if None)
+        
+        Returns:
+            Translated text or None if failed
+        """
+        if not text or not text.strip():
+            return text
+        
+        if target_language not in self.supported_languages:
+            logger.warning(f"Unsupported target language: {target_language}")
+            return None
+        
+        # Multi-line texts would break the numbered-list format
+        if not USE_LLM_TRANSLATION or "\n" in text.strip():
+            return await asyncio.to_thread(self.translate_text, text, target_language, source_language)
+        
+        key = (source_language, target_language)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = _TranslationBatcher(self, target_language, source_language)
+            self._batchers[key] = batcher
+        return await batcher.submit(text.strip())
+    
+    def _translate_batch_with_llm(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: Optional[str] = None
+    ) -> Optional[List[str]]:
+        """
+        Translate several texts with one LLM call using a numbered-list prompt.
+        
+        Returns:
+            Translations in input order, or None if the response could not be parsed
+        """
+        target_lang_name = self.supported_languages.get(target_language, target_language)
+        if source_language:
+            source_lang_name = self.supported_languages.get(source_language, source_language)
+            header = f"Translate each line from {source_lang_name} to {target_lang_name}, preserve line count."
+        else:
+            header = f"Translate each line to {target_lang_name}, preserve line count."
+        numbered = "\n".join(f"{i}) {text}" for i, text in enumerate(texts, 1))
+        prompt = f"{header} Only return the numbered translations, nothing else:\n{numbered}"
+        
+        models = ["tinyllama", "phi3:mini", "llama3.2:1b", "llama3.2"]
+        
+        for model in models:
+            try:
+                result = subprocess.run(
+                    ["ollama", "run", model],
+                    input=prompt.encode(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=30,
+                    check=False
+                )
+                if result.returncode != 0:
+                    continue
+                
+                translations = _parse_numbered_lines(result.stdout.decode(), len(texts))
+                if translations:
+                    logger.info(f"Translated batch of {len(texts)} via LLM ({model})")
+                    return translations
+                logger.debug(f"Could not parse batched translation from {model}")
+            except Exception as e:
+                logger.debug(f"Batched LLM translation failed with {model}: {e}")
+                continue
+        
+        return None
+    
     def _translate_with_llm(
         self,
         text: str,
@@ -86,8 +179,6 @@ class Translator:
         More accurate and context-aware.
         """
         try:
-            import subprocess
-            
             target_lang_name = self.supported_languages.get(target_language, target_language)
             
             # Build translation prompt
@@ -178,6 +269,120 @@ class Translator:
         return self.supported_languages.copy()
 
 
+def _parse_numbered_lines(output: str, expected: int) -> Optional[List[str]]:
+    """Parse "1) ..." lines from LLM output; None unless every index 1..expected is present"""
+    found = {}
+    for line in output.splitlines():
+        match = _NUMBERED_LINE_RE.match(line)
+        if match:
+            index = int(match.group(1))
+            if 1 <= index <= expected and index not in found:
+                found[index] = match.group(2)
+    
+    if len(found) != expected:
+        return None
+    return [found[i] for i in range(1, expected + 1)]
+
+
+class _TranslationBatcher:
+    """
+    Coalesces concurrent translation requests for one language pair.
+    Waits up to BATCH_MAX_WAIT_MS (or BATCH_MAX_SIZE texts), sends a single
+    numbered-list prompt, and resolves each waiter with its own line.
+    Falls back to per-item translation if the batched response can't be parsed.
+    """
+    
+    def __init__(
+        self,
+        translator: Translator,
+        target_language: str,
+        source_language: Optional[str] = None,
+        max_batch: int = BATCH_MAX_SIZE,
+        max_wait_ms: int = BATCH_MAX_WAIT_MS
+    ):
+        self.translator = translator
+        self.target_language = target_language
+        self.source_language = source_language
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, text: str) -> Optional[str]:
+        """Queue text for translation and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((text, future))
+        
+        # Worker exits when the queue drains; restart it on demand
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        
+        return await future
+    
+    async def _run(self):
+        """Collect batches from the queue and translate them until it is empty"""
+        loop = asyncio.get_running_loop()
+        
+        while not self.queue.empty():
+            batch = [self.queue.get_nowait()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Translate one batch and resolve its futures"""
+        texts = [text for text, _ in batch]
+        
+        try:
+            translations = None
+            if len(texts) > 1:
+                translations = await asyncio.to_thread(
+                    self.translator._translate_batch_with_llm,
+                    texts,
+                    self.target_language,
+                    self.source_language
+                )
+            
+            if translations is None:
+                # Single item or unparseable batch - translate individually
+                translations = await asyncio.gather(*[
+                    asyncio.to_thread(
+                        self.translator.translate_text,
+                        text,
+                        self.target_language,
+                        self.source_language
+                    )
+                    for text in texts
+                ])
+            
+            for (_, future), translated in zip(batch, translations):
+                if not future.done():
+                    future.set_result(translated)
+        except Exception as e:
+            logger.warning(f"Batched translation error: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+# Global translator instance (shared so concurrent requests can be batched)
+_translator = Translator()
+
+
+def get_translator() -> Translator:
+    """Get global translator instance"""
+    return _translator
+
+
 async def translate_conversation(
     text: str,
     target_language: str,
@@ -194,6 +399,5 @@ async def translate_conversation(
     Returns:
         Translated text
     """
-    translator = Translator()
-    return translator.translate_text(text, target_language, source_language)
+    return await get_translator().translate_text_async(text, target_language, source_language)
 
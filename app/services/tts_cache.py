@@ -0,0 +1,178 @@
+"""
+TTS Audio Cache
+Content-addressed cache for synthesized speech (in-memory LRU + size-capped disk LRU)
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+TTS_CACHE_DIR = PROJECT_ROOT / "voices" / "cache"
+
+# Cache settings
+MEMORY_CACHE_SIZE = 512        # Max entries kept in RAM
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used files are deleted past this
+MAX_CACHEABLE_TEXT = 500       # Long, one-off replies aren't worth caching
+
+
+class TTSCache:
+    """
+    Caches synthesized WAV audio keyed by (voice, language, text).
+    Lookups hit an in-process LRU first, then voices/cache/<hash>.wav.
+    The disk tier is capped at max_disk_bytes; file mtimes record recency,
+    so the LRU order survives restarts.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = TTS_CACHE_DIR,
+        max_entries: int = MEMORY_CACHE_SIZE,
+        max_disk_bytes: int = DISK_CACHE_MAX_BYTES
+    ):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        # key -> file size, least recently used first
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load_disk_index()
+        logger.info(f"TTS cache initialized at {cache_dir} ({len(self._disk)} files, {self._disk_bytes} bytes)")
+
+    def _load_disk_index(self):
+        """Index existing cache files by mtime and trim the tier to its cap"""
+        files: Dict[str, os.stat_result] = {}
+        for path in self.cache_dir.iterdir():
+            try:
+                if path.suffix == ".tmp":
+                    # Left behind by an interrupted write
+                    path.unlink()
+                elif path.suffix == ".wav":
+                    files[path.stem] = path.stat()
+            except OSError:
+                continue
+
+        for key, st in sorted(files.items(), key=lambda item: item[1].st_mtime):
+            self._disk[key] = st.st_size
+            self._disk_bytes += st.st_size
+        self._evict_disk()
+
+    @staticmethod
+    def make_key(voice: str, language: str, text: str) -> str:
+        """Build the cache key (voice model path or cloned voice id, language, text)"""
+        raw = f"{voice}\0{language}\0{text}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, voice: str, language: str, text: str) -> Optional[bytes]:
+        """
+        Look up cached audio.
+
+        Returns:
+            WAV bytes, or None on a miss
+        """
+        if len(text) > MAX_CACHEABLE_TEXT:
+            return None
+
+        key = self.make_key(voice, language, text)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        path = self.cache_dir / f"{key}.wav"
+        try:
+            audio = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                self._forget_disk(key)
+            return None
+
+        self._remember(key, audio)
+        with self._lock:
+            self.hits += 1
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return audio
+
+    def put(self, voice: str, language: str, text: str, audio: bytes):
+        """Store synthesized audio in memory and on disk"""
+        if not audio or len(text) > MAX_CACHEABLE_TEXT:
+            return
+
+        key = self.make_key(voice, language, text)
+        self._remember(key, audio)
+
+        # Write to a temp file in the same directory then rename, so readers
+        # never see a partially written WAV
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self.cache_dir / f"{key}.wav")
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry: {e}")
+            return
+
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = len(audio)
+            self._disk_bytes += len(audio)
+            self._evict_disk()
+
+    def _forget_disk(self, key: str):
+        """Drop a key from the disk index (call with _lock held)"""
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _evict_disk(self):
+        """Delete least recently used files until under the cap (call with _lock held)"""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                (self.cache_dir / f"{key}.wav").unlink()
+            except OSError:
+                pass
+
+    def _remember(self, key: str, audio: bytes):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        with self._lock:
+            self._memory[key] = audio
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        return {
+            'memory_entries': len(self._memory),
+            'disk_entries': len(self._disk),
+            'disk_bytes': self._disk_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+# Global TTS cache instance
+_tts_cache = TTSCache()
+
+
+def get_tts_cache() -> TTSCache:
+    """Get global TTS cache instance"""
+    return _tts_cache
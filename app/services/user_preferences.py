@@ -3,10 +3,11 @@ User Preferences Service
 Manages user preferences and settings storage
 """
 import logging
-import json
+import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
+from app.utils import json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +30,7 @@ class UserPreferences:
         """Load preferences from storage"""
         if self.preferences_file.exists():
             try:
-                with open(self.preferences_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return json_loads(self.preferences_file.read_bytes())
             except Exception as e:
                 logger.warning(f"Failed to load preferences: {e}")
                 return self._get_default_preferences()
@@ -39,8 +39,10 @@ class UserPreferences:
     def _save_preferences(self):
         """Save preferences to storage"""
         try:
-            with open(self.preferences_file, "w", encoding="utf-8") as f:
-                json.dump(self.preferences, f, indent=2, ensure_ascii=False)
+            # Write to a temp file then swap in, so readers never see a partial file
+            tmp_file = self.preferences_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(json_dumps(self.preferences))
+            os.replace(tmp_file, self.preferences_file)
             logger.debug("Preferences saved successfully")
         except Exception as e:
             logger.error(f"Failed to save preferences: {e}")
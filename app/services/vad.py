@@ -2,10 +2,10 @@
 Voice Activity Detection (VAD) Service
 Detects when user stops speaking to auto-stop recording
 """
-import time
 import logging
 import numpy as np
 from typing import Optional
+from time import time as _now
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +36,13 @@ class VoiceActivityDetector:
         self.min_silence_duration = min_silence_duration
         self.speech_threshold = speech_threshold
         self.sample_rate = sample_rate
+        self.min_silence_samples = int(min_silence_duration * sample_rate)
         
-        # State tracking
-        self.silence_start: Optional[float] = None
-        self.last_speech_time: Optional[float] = None
+        # State tracking (positions are sample offsets, so elapsed time comes
+        # from the audio itself rather than the wall clock)
+        self.samples_seen = 0
+        self.silence_start_samples: Optional[int] = None
+        self.last_speech_samples: Optional[int] = None
         self.is_speaking = False
         self.silence_samples = 0
         self.speech_samples = 0
@@ -49,8 +52,9 @@ class VoiceActivityDetector:
     
     def reset(self):
         """Reset VAD state (call when starting new recording)"""
-        self.silence_start = None
-        self.last_speech_time = None
+        self.samples_seen = 0
+        self.silence_start_samples = None
+        self.last_speech_samples = None
         self.is_speaking = False
         self.silence_samples = 0
         self.speech_samples = 0
@@ -94,7 +98,10 @@ class VoiceActivityDetector:
         Returns:
             dict with 'is_speaking', 'speech_ended', 'energy' keys
         """
-        current_time = time.time()
+        # 16-bit mono PCM: 2 bytes per sample
+        n_samples = len(audio_chunk) // 2
+        chunk_start = self.samples_seen
+        self.samples_seen += n_samples
         energy = self.calculate_rms_energy(audio_chunk)
         
         # Determine if this chunk contains speech
@@ -104,23 +111,25 @@ class VoiceActivityDetector:
         # Update state
         if has_speech:
             self.is_speaking = True
-            self.last_speech_time = current_time
-            self.silence_start = None
+            self.last_speech_samples = self.samples_seen
+            self.silence_start_samples = None
             self.speech_samples += 1
             self.silence_samples = 0
         elif is_silence:
             self.silence_samples += 1
             
             # Start tracking silence period
-            if self.silence_start is None and self.is_speaking:
-                self.silence_start = current_time
+            if self.silence_start_samples is None and self.is_speaking:
+                self.silence_start_samples = chunk_start
                 logger.debug(f"Silence started after speech (energy: {energy:.4f})")
         
         # Check if speech has ended
         speech_ended = False
-        if self.is_speaking and self.silence_start is not None:
-            silence_duration = current_time - self.silence_start
-            if silence_duration >= self.min_silence_duration:
+        silence_duration = 0.0
+        if self.silence_start_samples is not None:
+            silent_samples = self.samples_seen - self.silence_start_samples
+            silence_duration = silent_samples / self.sample_rate
+            if self.is_speaking and silent_samples >= self.min_silence_samples:
                 speech_ended = True
                 self.is_speaking = False
                 logger.info(f"Speech ended: {silence_duration:.2f}s of silence detected")
@@ -129,7 +138,7 @@ class VoiceActivityDetector:
             'is_speaking': self.is_speaking,
             'speech_ended': speech_ended,
             'energy': energy,
-            'silence_duration': (current_time - self.silence_start) if self.silence_start else 0.0
+            'silence_duration': silence_duration
         }
     
     def should_stop_recording(self, audio_chunk: bytes) -> bool:
@@ -167,8 +176,6 @@ class SimpleVAD:
         Check if speech has ended.
         Returns True if should stop recording.
         """
-        import time
-        
         # Simple energy calculation
         try:
             audio_array = np.frombuffer(audio_chunk, dtype=np.int16)
@@ -187,9 +194,9 @@ class SimpleVAD:
                 if self.is_speaking:
                     # We were speaking, now silence
                     if self.silence_start is None:
-                        self.silence_start = time.time() * 1000  # milliseconds
+                        self.silence_start = _now() * 1000  # milliseconds
                     else:
-                        silence_duration = (time.time() * 1000) - self.silence_start
+                        silence_duration = (_now() * 1000) - self.silence_start
                         if silence_duration >= self.min_silence_ms:
                             # Enough silence, speech ended
                             self.is_speaking = False
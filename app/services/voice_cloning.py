@@ -2,13 +2,19 @@
 Voice Cloning Service
 Allows users to clone their voice for personalized TTS
 """
+import asyncio
 import subprocess
 import tempfile
+import io
 import os
+import wave
 import logging
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List
-import json
+from typing import Optional, List, Dict
+from app.utils import TEMP_DIR, json_dumps, json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +22,13 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 VOICES_DIR = PROJECT_ROOT / "voices"
 CLONED_VOICES_DIR = PROJECT_ROOT / "cloned_voices"
 CLONED_VOICES_DIR.mkdir(exist_ok=True)
+# Previews live in a subdirectory: writing them into CLONED_VOICES_DIR would
+# change its mtime and force a full rescan of the voices on the next lookup
+PREVIEWS_DIR = CLONED_VOICES_DIR / "previews"
+PREVIEWS_DIR.mkdir(exist_ok=True)
+
+# Short phrase synthesized ahead of time for voice-picker previews
+PREVIEW_PHRASE = "Hello, this is my voice."
 
 
 class VoiceCloningService:
@@ -25,17 +38,100 @@ class VoiceCloningService:
     """
     
     def __init__(self):
-        self.cloned_voices = {}
+        self.cloned_voices: Dict[str, str] = {}
+        self.voice_info: Dict[str, dict] = {}  # Parsed <voice_id>.json, kept in sync with cloned_voices
+        self._dir_mtime = 0.0
         self._load_cloned_voices()
+        # Generate missing previews in the background so init isn't blocked
+        threading.Thread(target=self.prewarm_previews, daemon=True).start()
         logger.info("Voice cloning service initialized")
     
+    def _get_dir_mtime(self) -> float:
+        """Modification time of the cloned voices directory (0.0 if missing)"""
+        try:
+            return CLONED_VOICES_DIR.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    def _refresh_if_changed(self):
+        """Rescan the cloned voices directory only if it changed since the last scan"""
+        if self._get_dir_mtime() != self._dir_mtime:
+            self._load_cloned_voices()
+    
     def _load_cloned_voices(self):
         """Load existing cloned voices"""
-        if CLONED_VOICES_DIR.exists():
-            for voice_file in CLONED_VOICES_DIR.glob("*.onnx"):
-                voice_id = voice_file.stem
-                self.cloned_voices[voice_id] = str(voice_file)
-                logger.info(f"Loaded cloned voice: {voice_id}")
+        self._dir_mtime = self._get_dir_mtime()
+        try:
+            # scandir entries carry name and type, so no per-file stat is needed
+            with os.scandir(CLONED_VOICES_DIR) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".onnx") or not entry.is_file(follow_symlinks=False):
+                        continue
+                    voice_id = entry.name[:-5]
+                    self.cloned_voices[voice_id] = entry.path
+                    self._load_voice_info(voice_id)
+                    logger.info("Loaded cloned voice: %s", voice_id)
+        except FileNotFoundError:
+            pass
+    
+    def _load_voice_info(self, voice_id: str):
+        """Read <voice_id>.json into the in-memory info cache (if present)"""
+        info_path = CLONED_VOICES_DIR / f"{voice_id}.json"
+        try:
+            self.voice_info[voice_id] = json_loads(info_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Failed to load voice info for %s: %s", voice_id, e)
+    
+    def _preview_path(self, voice_id: str) -> Path:
+        """Path of the cached preview WAV for a voice"""
+        return PREVIEWS_DIR / f"{voice_id}.wav"
+    
+    def _generate_preview(self, voice_id: str, voice_path: str, phrase: str) -> Optional[bytes]:
+        """Synthesize and store a preview for one voice"""
+        from app.services.fast_tts import text_to_speech_fast
+        
+        try:
+            audio = text_to_speech_fast(phrase, voice=voice_path)
+            self._preview_path(voice_id).write_bytes(audio)
+            return audio
+        except Exception as e:
+            logger.warning("Preview generation failed for %s: %s", voice_id, e)
+            return None
+    
+    def prewarm_previews(self, phrase: str = PREVIEW_PHRASE):
+        """
+        Synthesize preview audio for every cloned voice that doesn't have one yet.
+        Piper invocations run in parallel on a thread pool.
+        
+        Args:
+            phrase: Text spoken in the preview
+        """
+        missing = [
+            (voice_id, path) for voice_id, path in list(self.cloned_voices.items())
+            if os.path.exists(path) and not self._preview_path(voice_id).exists()
+        ]
+        if not missing:
+            return
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for voice_id, path in missing:
+                executor.submit(self._generate_preview, voice_id, path, phrase)
+        
+        logger.info("Generated previews for %d cloned voices", len(missing))
+    
+    def get_voice_preview(self, voice_id: str) -> Optional[bytes]:
+        """Get preview audio for a cloned voice, synthesizing it if not cached"""
+        voice_path = self.cloned_voices.get(voice_id)
+        if not voice_path or not os.path.exists(voice_path):
+            return None
+        
+        preview_path = self._preview_path(voice_id)
+        if preview_path.exists():
+            return preview_path.read_bytes()
+        
+        return self._generate_preview(voice_id, voice_path, PREVIEW_PHRASE)
     
     def clone_voice(
         self,
@@ -45,7 +141,30 @@ class VoiceCloningService:
         min_samples: int = 3
     ) -> Optional[str]:
         """
-        Clone voice from audio samples.
+        Clone voice from audio samples (blocking wrapper for non-async callers).
+        Must not be called from a running event loop; use clone_voice_async there.
+        
+        Args:
+            audio_samples: List of audio samples in WAV format
+            user_id: User identifier
+            voice_name: Name for the cloned voice
+            min_samples: Minimum number of samples required
+        
+        Returns:
+            Path to cloned voice model or None if failed
+        """
+        return asyncio.run(self.clone_voice_async(audio_samples, user_id, voice_name, min_samples))
+    
+    async def clone_voice_async(
+        self,
+        audio_samples: List[bytes],
+        user_id: str,
+        voice_name: str,
+        min_samples: int = 3
+    ) -> Optional[str]:
+        """
+        Clone voice from audio samples. File writes run in worker threads so
+        the event loop isn't blocked.
         
         Args:
             audio_samples: List of audio samples in WAV format
@@ -57,24 +176,21 @@ class VoiceCloningService:
             Path to cloned voice model or None if failed
         """
         if len(audio_samples) < min_samples:
-            logger.warning(f"Not enough audio samples: {len(audio_samples)} < {min_samples}")
+            logger.warning("Not enough audio samples: %d < %d", len(audio_samples), min_samples)
             return None
         
         voice_id = f"{user_id}_{voice_name}"
         output_path = CLONED_VOICES_DIR / f"{voice_id}.onnx"
         
+        # Samples live in a private scratch dir, not in CLONED_VOICES_DIR
+        tmp_root = Path(tempfile.mkdtemp(prefix="vc_", dir=TEMP_DIR))
+        
         try:
-            # Save audio samples temporarily
-            sample_paths = []
-            for i, sample in enumerate(audio_samples):
-                sample_path = CLONED_VOICES_DIR / f"temp_{voice_id}_{i}.wav"
-                with open(sample_path, "wb") as f:
-                    f.write(sample)
-                sample_paths.append(str(sample_path))
+            sample_paths = await _save_samples(tmp_root, audio_samples)
             
             # For now, use a simple approach: combine samples and use as reference
             # In production, you'd use a proper voice cloning model (e.g., Coqui TTS)
-            logger.info(f"Cloning voice: {voice_id} from {len(audio_samples)} samples")
+            logger.info("Cloning voice: %s from %d samples", voice_id, len(audio_samples))
             
             # Placeholder: In production, use actual voice cloning model
             # For now, we'll create a reference file
@@ -87,45 +203,41 @@ class VoiceCloningService:
             }
             
             info_path = CLONED_VOICES_DIR / f"{voice_id}.json"
-            with open(info_path, "w") as f:
-                json.dump(voice_info, f)
+            await asyncio.to_thread(_write_bytes, info_path, json_dumps(voice_info, indent=True))
             
             # For now, use default voice but mark as cloned
             # In production, generate actual cloned model
-            logger.info(f"Voice cloning completed: {voice_id}")
-            
-            # Cleanup temp files
-            for path in sample_paths:
-                if os.path.exists(path):
-                    os.unlink(path)
+            logger.info("Voice cloning completed: %s", voice_id)
             
             # Store reference
             self.cloned_voices[voice_id] = str(output_path)
+            self.voice_info[voice_id] = voice_info
+            # Our own writes shouldn't trigger a rescan
+            self._dir_mtime = self._get_dir_mtime()
             
             return str(output_path)
             
         except Exception as e:
-            logger.error(f"Voice cloning failed: {e}", exc_info=True)
+            # Tracebacks are only worth walking when debugging
+            logger.error("Voice cloning failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
+        finally:
+            # Cleanup temp files
+            shutil.rmtree(tmp_root, ignore_errors=True)
     
     def get_cloned_voice(self, voice_id: str) -> Optional[str]:
         """Get path to cloned voice model"""
+        self._refresh_if_changed()
         return self.cloned_voices.get(voice_id)
     
     def list_cloned_voices(self, user_id: Optional[str] = None) -> List[dict]:
         """List all cloned voices, optionally filtered by user"""
-        voices = []
-        for voice_id, path in self.cloned_voices.items():
-            if user_id and not voice_id.startswith(f"{user_id}_"):
-                continue
-            
-            info_path = CLONED_VOICES_DIR / f"{voice_id}.json"
-            if info_path.exists():
-                with open(info_path, "r") as f:
-                    voice_info = json.load(f)
-                    voices.append(voice_info)
-        
-        return voices
+        self._refresh_if_changed()
+        prefix = f"{user_id}_" if user_id else ""
+        return [
+            info for voice_id, info in self.voice_info.items()
+            if voice_id.startswith(prefix)
+        ]
     
     def delete_cloned_voice(self, voice_id: str) -> bool:
         """Delete a cloned voice"""
@@ -138,13 +250,92 @@ class VoiceCloningService:
             if info_path.exists():
                 info_path.unlink()
             
+            preview_path = self._preview_path(voice_id)
+            if preview_path.exists():
+                preview_path.unlink()
+            
             del self.cloned_voices[voice_id]
-            logger.info(f"Deleted cloned voice: {voice_id}")
+            self.voice_info.pop(voice_id, None)
+            self._dir_mtime = self._get_dir_mtime()
+            logger.info("Deleted cloned voice: %s", voice_id)
             return True
         
         return False
 
 
+def _write_bytes(path, data: bytes):
+    """Write data to path (run via asyncio.to_thread)"""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def _save_samples(tmp_root: Path, audio_samples: List[bytes]) -> List[str]:
+    """
+    Save audio samples into tmp_root - as one merged reference WAV (single
+    write) when all samples share the same format, otherwise one file per
+    sample written concurrently.
+    
+    Returns:
+        Paths of the written sample files
+    """
+    try:
+        reference_path = tmp_root / "reference.wav"
+        await asyncio.to_thread(_write_bytes, reference_path, _merge_wav_samples(audio_samples))
+        return [str(reference_path)]
+    except (wave.Error, EOFError, ValueError) as e:
+        logger.debug("Could not merge samples (%s), saving individually", e)
+    
+    sample_paths = [tmp_root / f"{i}.wav" for i in range(len(audio_samples))]
+    await asyncio.gather(*[
+        asyncio.to_thread(_write_bytes, path, sample)
+        for path, sample in zip(sample_paths, audio_samples)
+    ])
+    return [str(path) for path in sample_paths]
+
+
+def _merge_wav_samples(samples: List[bytes]) -> bytes:
+    """
+    Concatenate WAV samples into a single WAV.
+    
+    Raises:
+        ValueError: If samples have different channel/width/rate parameters
+        wave.Error: If a sample isn't a valid WAV
+    """
+    params = None
+    frames = []
+    for sample in samples:
+        with wave.open(io.BytesIO(sample), "rb") as wav:
+            sample_params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+            if params is None:
+                params = sample_params
+            elif sample_params != params:
+                raise ValueError(f"Sample format mismatch: {sample_params} != {params}")
+            frames.append(wav.readframes(wav.getnframes()))
+    
+    if params is None:
+        raise ValueError("No samples to merge")
+    
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(params[0])
+        wav.setsampwidth(params[1])
+        wav.setframerate(params[2])
+        wav.writeframes(b"".join(frames))
+    return output.getvalue()
+
+
+# Global voice cloning service (created on first use)
+_voice_cloning_service: Optional[VoiceCloningService] = None
+
+
+def get_voice_cloning_service() -> VoiceCloningService:
+    """Get global voice cloning service instance"""
+    global _voice_cloning_service
+    if _voice_cloning_service is None:
+        _voice_cloning_service = VoiceCloningService()
+    return _voice_cloning_service
+
+
 def use_cloned_voice(text: str, voice_id: str) -> Optional[bytes]:
     """
     Generate speech using a cloned voice.
@@ -156,16 +347,18 @@ def use_cloned_voice(text: str, voice_id: str) -> Optional[bytes]:
     Returns:
         Audio data in WAV format or None if failed
     """
-    service = VoiceCloningService()
+    service = get_voice_cloning_service()
     voice_path = service.get_cloned_voice(voice_id)
     
     if not voice_path or not os.path.exists(voice_path):
-        logger.warning(f"Cloned voice not found: {voice_id}")
+        logger.warning("Cloned voice not found: %s", voice_id)
         return None
     
     # Use cloned voice with Piper
     # For now, fallback to default voice
     # In production, use actual cloned model
+    # (text_to_speech_fast caches by the voice model that actually synthesizes,
+    # so the audio isn't cached a second time here)
     from app.services.fast_tts import text_to_speech_fast
     return text_to_speech_fast(text, language="en", use_stdout=False)
 
@@ -3,13 +3,50 @@ Webhook Integration Service
 Sends conversation events to external services
 """
 import logging
-import requests
+import httpx
 import asyncio
-from typing import Dict, List, Optional
+import time
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from datetime import datetime
+from app.utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# Delivery settings
+MAX_RETRIES = 3                                  # Retries for 5xx responses
+RETRY_BACKOFF_FACTOR = 0.2                       # Sleep 0.2s, 0.4s, 0.8s between retries
+RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+POOL_MAX_CONNECTIONS = 200
+POOL_MAX_KEEPALIVE = 100
+
+# Circuit breaker: after this many consecutive failures a URL is skipped
+# for min(BREAKER_MAX_OPEN_SECONDS, 2 ** failures) seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_MAX_OPEN_SECONDS = 60
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Event timestamps are reused for events within the same 100 ms tick
+TIMESTAMP_RESOLUTION = 0.1
+_last_ts: Tuple[float, str] = (0.0, "")
+
+# Background delivery queue
+QUEUE_MAX_SIZE = 10_000             # Events beyond this are dropped (and counted)
+QUEUE_MAX_BATCH = 64                # Events drained per worker iteration
+QUEUE_BACKLOG_THRESHOLD = 1_000     # Backlog size that counts as "falling behind"
+QUEUE_BACKLOG_ALERT_SECONDS = 5.0   # Log an error if backlog persists this long
+
+
+def _iso_now() -> str:
+    """Current local time as an ISO string, cached per TIMESTAMP_RESOLUTION tick"""
+    global _last_ts
+    
+    now = time.time()
+    if now - _last_ts[0] >= TIMESTAMP_RESOLUTION:
+        _last_ts = (now, datetime.fromtimestamp(now).isoformat())
+    return _last_ts[1]
+
 
 class WebhookService:
     """
@@ -19,7 +56,28 @@ class WebhookService:
     
     def __init__(self):
         self.webhooks: Dict[str, List[str]] = {}  # {event_type: [urls]}
+        # Read-only snapshot of self.webhooks used on the delivery path;
+        # rebuilt per event type on register/unregister
+        self._frozen: Dict[str, Tuple[str, ...]] = {}
+        # Per-URL circuit breaker state: {url: (consecutive_failures, open_until)}
+        self._breaker: Dict[str, Tuple[int, float]] = {}
         self.enabled = True
+        # Shared async client: pooled keep-alive connections (TCP/TLS reused
+        # per host), transport-level retries for failed connects
+        limits = httpx.Limits(
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            max_connections=POOL_MAX_CONNECTIONS
+        )
+        self._client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(limits=limits, http2=True, retries=MAX_RETRIES),
+            timeout=httpx.Timeout(5.0)
+        )
+        # Events are queued by send_webhook and delivered by a single worker,
+        # so callers never wait on webhook endpoints
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX_SIZE)
+        self.dropped_events = 0
+        self._worker_task: Optional[asyncio.Task] = None
+        self._backlog_since: Optional[float] = None
         logger.info("Webhook service initialized")
     
     def register_webhook(
@@ -39,7 +97,8 @@ class WebhookService:
         
         if url not in self.webhooks[event_type]:
             self.webhooks[event_type].append(url)
-            logger.info(f"Registered webhook: {event_type} -> {url}")
+            self._freeze(event_type)
+            logger.info("Registered webhook: %s -> %s", event_type, url)
     
     def unregister_webhook(
         self,
@@ -49,7 +108,20 @@ class WebhookService:
         """Unregister a webhook URL"""
         if event_type in self.webhooks and url in self.webhooks[event_type]:
             self.webhooks[event_type].remove(url)
-            logger.info(f"Unregistered webhook: {event_type} -> {url}")
+            self._freeze(event_type)
+            logger.info("Unregistered webhook: %s -> %s", event_type, url)
+    
+    def _freeze(self, event_type: str):
+        """Rebuild the frozen URL tuple for one event type"""
+        urls = self.webhooks.get(event_type)
+        if urls:
+            self._frozen[event_type] = tuple(urls)
+        else:
+            self._frozen.pop(event_type, None)
+    
+    def has_subscribers(self, event_type: str) -> bool:
+        """Check whether an event would be delivered anywhere (lets callers skip building payloads)"""
+        return self.enabled and event_type in self._frozen
     
     async def send_webhook(
         self,
@@ -58,7 +130,8 @@ class WebhookService:
         timeout: int = 5
     ):
         """
-        Send webhook for an event.
+        Queue a webhook for an event. Returns immediately; delivery happens
+        on the background worker.
         
         Args:
             event_type: Type of event
@@ -68,25 +141,60 @@ class WebhookService:
         if not self.enabled:
             return
         
-        if event_type not in self.webhooks:
-            return
-        
-        urls = self.webhooks[event_type]
-        if not urls:
+        if event_type not in self._frozen:
             return
         
         # Prepare payload
         payload = {
             'event_type': event_type,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
             'data': data
         }
+        # Encode once; the same bytes go to every registered URL
+        body = json_dumps(payload)
         
-        # Send to all registered URLs
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait((event_type, body, timeout))
+        except asyncio.QueueFull:
+            self.dropped_events += 1
+            logger.warning("Webhook queue full, dropped %s event (total dropped: %d)", event_type, self.dropped_events)
+    
+    def _ensure_worker(self):
+        """Start the delivery worker on the running loop if it isn't running"""
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.get_running_loop().create_task(self._worker())
+    
+    async def _worker(self):
+        """Drain queued events in batches and deliver them concurrently"""
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < QUEUE_MAX_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                self._check_backlog()
+                await self._deliver_batch(batch)
+            except Exception as e:
+                logger.error("Webhook worker error: %s", e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+    
+    async def _deliver_batch(self, batch: List[Tuple[str, bytes, int]]):
+        """Send every queued event to all of its registered URLs concurrently"""
+        urls = []
         tasks = []
-        for url in urls:
-            task = self._send_webhook_request(url, payload, timeout)
-            tasks.append(task)
+        for event_type, body, timeout in batch:
+            for url in self._frozen.get(event_type, ()):
+                urls.append(url)
+                tasks.append(self._send_webhook_request(url, body, timeout))
+        
+        if not tasks:
+            return
         
         # Execute all webhooks concurrently
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -94,33 +202,85 @@ class WebhookService:
         # Log results
         for url, result in zip(urls, results):
             if isinstance(result, Exception):
-                logger.warning(f"Webhook failed for {url}: {result}")
-            else:
-                logger.debug(f"Webhook sent to {url}")
+                logger.warning("Webhook failed for %s: %s", url, result)
+            elif result is not None:
+                logger.debug("Webhook sent to %s", url)
+    
+    def _check_backlog(self):
+        """Log an error if the queue stays above the backlog threshold too long"""
+        if self.queue.qsize() < QUEUE_BACKLOG_THRESHOLD:
+            self._backlog_since = None
+            return
+        
+        now = time.monotonic()
+        if self._backlog_since is None:
+            self._backlog_since = now
+        elif now - self._backlog_since > QUEUE_BACKLOG_ALERT_SECONDS:
+            logger.error(
+                "Webhook queue backlog: %d events pending for %.1fs - endpoints may be too slow",
+                self.queue.qsize(), now - self._backlog_since
+            )
+            self._backlog_since = now
     
     async def _send_webhook_request(
         self,
         url: str,
-        payload: Dict,
+        body: bytes,
         timeout: int
     ):
-        """Send HTTP POST request to webhook URL"""
+        """
+        Send HTTP POST request to webhook URL (retries 5xx with backoff).
+        
+        Returns:
+            The response, or None if the URL's circuit is open and the POST was skipped
+        """
+        fails, open_until = self._breaker.get(url, (0, 0.0))
+        if fails >= BREAKER_FAILURE_THRESHOLD and time.monotonic() < open_until:
+            logger.debug("Circuit open for %s, skipping webhook", url)
+            return None
+        
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                timeout=timeout,
-                headers={'Content-Type': 'application/json'}
-            )
+            for attempt in range(MAX_RETRIES + 1):
+                response = await self._client.post(
+                    url,
+                    content=body,
+                    timeout=timeout,
+                    headers=JSON_HEADERS
+                )
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    break
+                await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** attempt))
+            
             response.raise_for_status()
-            return response
         except Exception as e:
-            logger.error(f"Webhook request failed for {url}: {e}")
+            self._record_failure(url, fails + 1)
+            logger.error("Webhook request failed for %s: %s", url, e, exc_info=logger.isEnabledFor(logging.DEBUG))
             raise
+        
+        self._breaker.pop(url, None)
+        return response
+    
+    def _record_failure(self, url: str, fails: int):
+        """Count a failed delivery and open the circuit once the threshold is reached"""
+        open_until = 0.0
+        if fails >= BREAKER_FAILURE_THRESHOLD:
+            open_until = time.monotonic() + min(BREAKER_MAX_OPEN_SECONDS, 2 ** fails)
+            logger.warning("Circuit opened for %s after %d consecutive failures", url, fails)
+        self._breaker[url] = (fails, open_until)
+    
+    def get_registered_webhooks(self) -> Mapping[str, Tuple[str, ...]]:
+        """Get all registered webhooks (read-only view, no copy)"""
+        return MappingProxyType(self._frozen)
     
-    def get_registered_webhooks(self) -> Dict[str, List[str]]:
-        """Get all registered webhooks"""
-        return self.webhooks.copy()
+    async def aclose(self):
+        """Stop the delivery worker and close the shared HTTP client (call on app shutdown)"""
+        if self._worker_task is not None and not self._worker_task.done():
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+        await self._client.aclose()
 
 
 # Global webhook service instance
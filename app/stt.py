@@ -1,33 +1,261 @@
 import subprocess
 import tempfile
+import logging
 import os
+import time
+import atexit
+import socket
+import threading
+import requests
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+from app.config.languages import whisper_model_path
+from app.utils import TEMP_DIR
+
+logger = logging.getLogger(__name__)
 
 # Get the project root directory (parent of app directory)
 PROJECT_ROOT = Path(__file__).parent.parent
 WHISPER_PATH = str(PROJECT_ROOT / "whisper.cpp" / "build" / "bin" / "whisper-cli")
-DEFAULT_MODEL = str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.en.bin")
-MULTILINGUAL_MODEL = str(PROJECT_ROOT / "whisper.cpp" / "models" / "ggml-base.bin")
+DEFAULT_MODEL = whisper_model_path("base.en")
+MULTILINGUAL_MODEL = whisper_model_path("base")
+WHISPER_SERVER_PATH = str(PROJECT_ROOT / "whisper.cpp" / "build" / "bin" / "whisper-server")
+
+# Persistent whisper-server settings (model is loaded once per daemon)
+SERVER_HOST = "127.0.0.1"
+SERVER_STARTUP_TIMEOUT = 30  # seconds to wait for a daemon to accept requests
+SERVER_REQUEST_TIMEOUT = 60  # seconds per transcription request
+
+# whisper's progress output on stderr is only captured when debugging (the
+# stdin call always captures it, to detect builds that can't read stdin)
+_STDERR = subprocess.PIPE if os.getenv("WHISPER_DEBUG") else subprocess.DEVNULL
+
+# A daemon that fails to start (or stops answering) isn't retried for
+# min(SERVER_RETRY_MAX_SECONDS, SERVER_RETRY_BASE_SECONDS * 2 ** (failures - 1)) seconds
+SERVER_RETRY_BASE_SECONDS = 5
+SERVER_RETRY_MAX_SECONDS = 300
+
+# Running daemons keyed by model path: (process, base_url)
+_servers: Dict[str, Tuple[subprocess.Popen, str]] = {}
+# Per-model failure state: {model_path: (consecutive_failures, retry_at)}
+_server_failures: Dict[str, Tuple[int, float]] = {}
+# Per-model startup locks, so starting one daemon never blocks other models
+_start_locks: Dict[str, threading.Lock] = {}
+# Guards the three dicts above (never held while a daemon starts)
+_servers_lock = threading.Lock()
+# Keep-alive HTTP session for daemon requests
+_session = requests.Session()
+
+
+def _find_free_port() -> int:
+    """Ask the OS for an unused local port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((SERVER_HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _running_server_url(model_path: str) -> Optional[str]:
+    """Base URL of a live daemon for this model (call with _servers_lock held)"""
+    entry = _servers.get(model_path)
+    if entry and entry[0].poll() is None:
+        return entry[1]
+    return None
+
+
+def _get_server_url(model_path: str) -> Optional[str]:
+    """
+    Get the base URL of a whisper-server daemon for this model, starting one if needed.
+    While a daemon is starting, other callers for the same model get None
+    (and use the CLI) instead of waiting for it.
+    
+    Returns:
+        Base URL, or None if the server binary is missing, is starting, or
+        recently failed
+    """
+    if not os.path.exists(WHISPER_SERVER_PATH):
+        return None
+    
+    with _servers_lock:
+        url = _running_server_url(model_path)
+        if url:
+            return url
+        fails, retry_at = _server_failures.get(model_path, (0, 0.0))
+        if fails and time.monotonic() < retry_at:
+            return None
+        start_lock = _start_locks.setdefault(model_path, threading.Lock())
+    
+    if not start_lock.acquire(blocking=False):
+        return None
+    try:
+        with _servers_lock:
+            # Another caller may have finished starting it
+            url = _running_server_url(model_path)
+            if url:
+                return url
+        
+        entry = _start_server(model_path)
+        with _servers_lock:
+            if entry is None:
+                _record_server_failure(model_path)
+                return None
+            _servers[model_path] = entry
+            _server_failures.pop(model_path, None)
+        return entry[1]
+    finally:
+        start_lock.release()
+
+
+def _start_server(model_path: str) -> Optional[Tuple[subprocess.Popen, str]]:
+    """
+    Launch a whisper-server daemon and wait until it accepts connections.
+    
+    Returns:
+        (process, base_url), or None if it exited or didn't start in time
+    """
+    port = _find_free_port()
+    url = f"http://{SERVER_HOST}:{port}"
+    proc = subprocess.Popen(
+        [WHISPER_SERVER_PATH, "-m", model_path, "--host", SERVER_HOST, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    
+    # Wait for the model to load and the server to accept connections
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            logger.warning(f"whisper-server exited during startup (code {proc.returncode})")
+            return None
+        try:
+            with socket.create_connection((SERVER_HOST, port), timeout=0.5):
+                break
+        except OSError:
+            time.sleep(0.1)
+    else:
+        logger.warning("whisper-server did not start in time, using CLI")
+        proc.terminate()
+        return None
+    
+    logger.info(f"Started whisper-server for {Path(model_path).name} at {url}")
+    return proc, url
+
+
+def _record_server_failure(model_path: str):
+    """Back off before the next start attempt (call with _servers_lock held)"""
+    fails = _server_failures.get(model_path, (0, 0.0))[0] + 1
+    delay = min(SERVER_RETRY_MAX_SECONDS, SERVER_RETRY_BASE_SECONDS * 2 ** (fails - 1))
+    _server_failures[model_path] = (fails, time.monotonic() + delay)
+    logger.warning(f"whisper-server for {Path(model_path).name} unavailable, retrying in {delay}s")
+
+
+def _server_request_failed(model_path: str):
+    """Drop a daemon that stopped answering and back off before restarting it"""
+    with _servers_lock:
+        entry = _servers.pop(model_path, None)
+        if entry and entry[0].poll() is None:
+            entry[0].terminate()
+        _record_server_failure(model_path)
+
+
+@atexit.register
+def _stop_servers():
+    """Terminate all whisper-server daemons"""
+    with _servers_lock:
+        for proc, _ in _servers.values():
+            if proc.poll() is None:
+                proc.terminate()
+        _servers.clear()
+
+
+def _transcribe_via_server(url: str, audio_bytes: bytes, lang_args: list) -> str:
+    """Send audio to a running whisper-server daemon"""
+    data = {"response_format": "text"}
+    if lang_args:
+        data["language"] = lang_args[1]
+    
+    response = _session.post(
+        f"{url}/inference",
+        files={"file": ("audio.wav", audio_bytes, "audio/wav")},
+        data=data,
+        timeout=SERVER_REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.text.strip()
 
 
 def speech_to_text(audio_bytes: bytes, language: str = "en") -> str:
     """
     Convert speech to text using Whisper.
-    
+    Uses a persistent whisper-server daemon (model loaded once) when the binary
+    is available; otherwise audio is piped to whisper-cli on stdin, with a tmpfs
+    temp file only if the installed build can't read stdin.
+
     Args:
         audio_bytes: Audio data in WAV format
         language: Language code (e.g., 'en', 'es'). Uses appropriate model.
-    
+
     Returns:
         Transcribed text
     """
     from app.config.languages import get_language_config
-    
+
     # Get language-specific model
     lang_config = get_language_config(language)
     model_path = lang_config.get('stt_model', DEFAULT_MODEL)
-    
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+
+    # Verify paths exist
+    if not os.path.exists(WHISPER_PATH):
+        raise FileNotFoundError(f"Whisper CLI not found at: {WHISPER_PATH}")
+    if not os.path.exists(model_path):
+        logger.warning(f"Model not found at {model_path}, using default")
+        model_path = DEFAULT_MODEL
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Whisper model not found at: {model_path}")
+
+    if not audio_bytes:
+        raise ValueError("Audio data is empty")
+
+    # Add language parameter if not English (for multilingual model)
+    lang_args = []
+    if language != "en" and os.path.exists(MULTILINGUAL_MODEL):
+        lang_args = ["--language", language]
+        # Use multilingual model for non-English
+        if model_path == DEFAULT_MODEL:
+            model_path = MULTILINGUAL_MODEL
+
+    # Persistent daemon avoids reloading the model on every call
+    server_url = _get_server_url(model_path)
+    if server_url:
+        try:
+            return _transcribe_via_server(server_url, audio_bytes, lang_args)
+        except requests.RequestException as e:
+            logger.warning(f"whisper-server request failed: {e}, falling back to CLI")
+            _server_request_failed(model_path)
+
+    cmd = [WHISPER_PATH, "-m", model_path, "-f", "-", "--no-timestamps", *lang_args]
+    result = subprocess.run(
+        cmd,
+        input=audio_bytes,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False
+    )
+
+    if not _stdin_read_failed(result):
+        return result.stdout.decode('utf-8', errors='ignore').strip()
+
+    logger.warning("Whisper could not read audio from stdin, falling back to temp file")
+    return _speech_to_text_via_file(audio_bytes, model_path, lang_args)
+
+
+def _stdin_read_failed(result: subprocess.CompletedProcess) -> bool:
+    """whisper-cli reports unreadable input on stderr but may still exit 0"""
+    return result.returncode != 0 or b"failed to read" in (result.stderr or b"")
+
+
+def _speech_to_text_via_file(audio_bytes: bytes, model_path: str, lang_args: list) -> str:
+    """Transcribe via a temp WAV file (for whisper-cli builds without stdin support)"""
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR, delete=False) as temp_file:
         temp_file.write(audio_bytes)
         wav_path = temp_file.name
 
@@ -35,40 +263,9 @@ def speech_to_text(audio_bytes: bytes, language: str = "en") -> str:
     txt_path = wav_path + ".txt"
 
     try:
-        # Verify paths exist
-        if not os.path.exists(WHISPER_PATH):
-            raise FileNotFoundError(f"Whisper CLI not found at: {WHISPER_PATH}")
-        if not os.path.exists(model_path):
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Model not found at {model_path}, using default")
-            model_path = DEFAULT_MODEL
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"Whisper model not found at: {model_path}")
-        
-        # Check WAV file size
-        wav_size = os.path.getsize(wav_path)
-        if wav_size == 0:
-            raise ValueError(f"Audio file is empty: {wav_path}")
-        
-        # Build command with language support
-        cmd = [WHISPER_PATH, "-m", model_path, "-f", wav_path, "--no-timestamps", "-otxt"]
-        
-        # Add language parameter if not English (for multilingual model)
-        if language != "en" and os.path.exists(MULTILINGUAL_MODEL):
-            cmd.extend(["--language", language])
-            # Use multilingual model for non-English
-            if model_path == DEFAULT_MODEL:
-                cmd[cmd.index("-m") + 1] = MULTILINGUAL_MODEL
-        
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
-        
-        # Log stderr for debugging
-        if result.stderr:
-            stderr_text = result.stderr.decode('utf-8', errors='ignore')
-            if stderr_text.strip():
-                print(f"Whisper stderr: {stderr_text}")
-        
+        cmd = [WHISPER_PATH, "-m", model_path, "-f", wav_path, "--no-timestamps", "-otxt", *lang_args]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=_STDERR, check=False)
+
         # Check if output file was created
         if not os.path.exists(txt_path):
             error_msg = f"Whisper output file not created: {txt_path}"
@@ -86,4 +283,4 @@ def speech_to_text(audio_bytes: bytes, language: str = "en") -> str:
         if os.path.exists(wav_path):
             os.unlink(wav_path)
         if os.path.exists(txt_path):
-            os.unlink(txt_path)
\ No newline at end of file
+            os.unlink(txt_path)
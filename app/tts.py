@@ -3,6 +3,8 @@ import tempfile
 import os
 import logging
 from pathlib import Path
+from app.utils import TEMP_DIR
+from app.services.tts_cache import get_tts_cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,33 +12,78 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent
 DEFAULT_VOICE = str(PROJECT_ROOT / "voices" / "en_US-lessac-medium.onnx")
 
+# piper's stderr is only captured when debugging
+_STDERR = subprocess.PIPE if os.getenv("WHISPER_DEBUG") else subprocess.DEVNULL
+
 
 def text_to_speech(text: str, language: str = "en") -> bytes:
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+    """
+    Convert text to speech using Piper.
+    Text is fed on stdin and the WAV read from stdout; a tmpfs temp file is
+    only used if the installed piper build can't write to stdout.
+    """
+    from app.config.languages import get_language_config
+
+    # Get language-specific voice model
+    lang_config = get_language_config(language)
+    voice_model = lang_config.get('tts_voice', DEFAULT_VOICE)
+
+    if not os.path.exists(voice_model):
+        logger.warning(f"Voice model not found at {voice_model}, using default")
+        voice_model = DEFAULT_VOICE
+        if not os.path.exists(voice_model):
+            raise FileNotFoundError(f"Voice model not found at: {voice_model}")
+
+    # Repeated phrases (greetings, errors) are served from cache
+    cache = get_tts_cache()
+    cached = cache.get(voice_model, language, text)
+    if cached is not None:
+        return cached
+
+    audio = _synthesize(text, voice_model)
+    cache.put(voice_model, language, text, audio)
+    return audio
+
+
+def _synthesize(text: str, voice_model: str) -> bytes:
+    """Run piper, reading WAV from stdout"""
+    cmd = ["piper", "--model", voice_model, "--output-file", "-"]
+    result = subprocess.run(
+        cmd,
+        input=text.encode("utf-8"),
+        stdout=subprocess.PIPE,
+        stderr=_STDERR,
+        check=True
+    )
+
+    # WAV output always starts with a RIFF header
+    if result.stdout.startswith(b"RIFF"):
+        return result.stdout
+
+    logger.warning("Piper did not write WAV to stdout, falling back to temp file")
+    return _text_to_speech_via_file(text, voice_model)
+
+
+def _text_to_speech_via_file(text: str, voice_model: str) -> bytes:
+    """Synthesize via a temp WAV file (for piper builds without stdout output)"""
+    with tempfile.NamedTemporaryFile(suffix=".wav", dir=TEMP_DIR, delete=False) as temp_file:
         wav_path = temp_file.name
 
     try:
-        from app.config.languages import get_language_config
-        
-        # Get language-specific voice model
-        lang_config = get_language_config(language)
-        voice_model = lang_config.get('tts_voice', DEFAULT_VOICE)
-        
-        if not os.path.exists(voice_model):
-            logger.warning(f"Voice model not found at {voice_model}, using default")
-            voice_model = DEFAULT_VOICE
-            if not os.path.exists(voice_model):
-                raise FileNotFoundError(f"Voice model not found at: {voice_model}")
-        
         cmd = [
             "piper",
             "--model", voice_model,
-            "--text", text,
             "--output-file", wav_path,
         ]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        subprocess.run(
+            cmd,
+            input=text.encode("utf-8"),
+            stdout=subprocess.PIPE,
+            stderr=_STDERR,
+            check=True
+        )
 
-        if not os.path.exists(wav_path):
+        if not os.path.exists(wav_path) or os.path.getsize(wav_path) == 0:
             raise FileNotFoundError(f"TTS output file not created: {wav_path}")
 
         with open(wav_path, "rb") as wav_file:
@@ -44,4 +91,4 @@ def text_to_speech(text: str, language: str = "en") -> bytes:
     finally:
         # Clean up temp file
         if os.path.exists(wav_path):
-            os.unlink(wav_path)
\ No newline at end of file
+            os.unlink(wav_path)
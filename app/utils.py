@@ -0,0 +1,47 @@
+"""
+Shared Utilities
+Fast JSON helpers (orjson when installed, stdlib json otherwise) and temp file location
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Scratch files (WAV/TXT handed to subprocesses) go to tmpfs when available,
+# so they never hit the disk
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        JSON as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":")
+    ).encode("utf-8")
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
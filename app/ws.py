@@ -1,30 +1,28 @@
 from fastapi import WebSocket, WebSocketDisconnect
 from app.stt import speech_to_text
-from app.llm import chat_with_llm
+from app.llm import chat_with_llm, clean_response
 from app.tts import text_to_speech
-from app.services.fast_stt import speech_to_text_fast
-from app.services.fast_tts import text_to_speech_fast
+from app.services.batcher import get_stt_batcher, get_stt_detect_batcher, get_tts_batcher
 from app.services.vad import SimpleVAD
 from app.services.memory_manager import ConversationMemory
-from app.services.context_analyzer import ContextAnalyzer
+from app.services.context_analyzer import get_context_analyzer
 from app.models.session import SessionManager
-from app.services.language_detector import detect_language
-from app.services.audio_buffer import StreamingAudioProcessor
-from app.services.emotion_detector import EmotionDetector
-from app.services.translator import Translator
-from app.services.voice_cloning import VoiceCloningService
+from app.services.audio_buffer import (
+    StreamingAudioProcessor, WAV_HEADER_SIZE, convert_to_wav, detect_container, write_wav_header
+)
+from app.services.emotion_detector import get_emotion_detector
 from app.services.analytics import get_analytics
-from app.services.webhook import get_webhook_service
 from app.services.model_selector import get_model_selector
-from app.services.tool_executor import get_tool_executor
-from app.services.rag import get_rag_service
-from app.services.user_preferences import get_user_preferences
-from app.services.error_handler import get_error_handler, ErrorType
-from app.services.reconnection_manager import get_reconnection_manager
-from app.middleware.rate_limiter import get_rate_limiter
-from app.config.languages import DEFAULT_LANGUAGE, AUTO_DETECT_LANGUAGE
+from app.services.response_cache import get_response_cache
+from app.config.languages import DEFAULT_LANGUAGE, AUTO_DETECT_LANGUAGE, is_language_supported
+from app.utils import json_dumps
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
 import logging
 import io
+import re
 import time
 
 logger = logging.getLogger(__name__)
@@ -32,6 +30,193 @@ logger = logging.getLogger(__name__)
 # Global session manager (shared across connections)
 _session_manager = SessionManager(session_timeout_minutes=30)
 
+# Feature flags. Services behind a disabled flag are never imported or
+# initialized; enabled ones are fetched inside their branch of the pipeline.
+USE_CONVERSATION_HISTORY = True  # Set to False to disable context
+USE_FAST_STT_TTS = True          # Use optimized STT/TTS (no file I/O overhead)
+STREAMING_ENABLED = True         # Stream LLM chunks and synthesize speech per sentence
+ENABLE_EMOTION_DETECTION = True  # Phase 2.3
+ENABLE_TRANSLATION = False       # Phase 2.4
+ENABLE_ANALYTICS = True          # Phase 3.1
+ENABLE_WEBHOOKS = True           # Phase 3.3: notify registered webhooks per message
+ENABLE_MODEL_SELECTION = True    # Phase 4.1
+ENABLE_TOOLS = False             # Phase 4.2: tool use / function calling
+ENABLE_RAG = False               # Phase 4.3: retrieval augmented generation
+ENABLE_RESPONSE_CACHE = False    # Phase 4.4: cache of replies + audio (per user)
+VAD_ENABLED = False              # Phase 1.2: buffer raw PCM streams until end of speech
+
+# Language detection: minimum audio size (~0.5s at 16kHz mono 16-bit), and the
+# confidence above which the detected language is kept for the rest of the session
+LANGUAGE_DETECT_MIN_BYTES = 16000
+LANGUAGE_LOCK_CONFIDENCE = 0.9
+
+# Words/phrases that can make a question depend on earlier turns. Questions
+# without any of them (and short enough) skip context analysis entirely.
+_CONTEXT_HINT_RE = re.compile(
+    r"\b(it|its|that|this|these|those|they|them|their|previous|last|earlier|before|"
+    r"also|too|again|and|more|else|same|similar|other|another|mentioned|said|"
+    r"continue|what about|how about|go on|keep going)\b"
+)
+CONTEXT_HINT_MAX_WORDS = 15
+
+
+def _maybe_needs_context(text: str) -> bool:
+    """Cheap pre-filter: False means the question is certainly standalone"""
+    return bool(_CONTEXT_HINT_RE.search(text.lower())) or len(text.split()) > CONTEXT_HINT_MAX_WORDS
+
+
+@lru_cache(maxsize=64)
+def _emotion_context(emotion: str, sentiment: str, tone: str, style: str, empathy: bool) -> str:
+    """Build the emotion hint appended to the LLM prompt ("" when neutral)"""
+    if emotion == 'neutral' and sentiment == 'neutral':
+        return ""
+    
+    hint = f"\n\nUser's emotional state: {emotion} ({sentiment}). "
+    hint += f"Respond with a {tone} tone and {style} style."
+    if empathy:
+        hint += " Show empathy and understanding."
+    return hint
+
+
+# End of a sentence for streaming TTS: terminal punctuation (plus any closing
+# quotes/brackets) followed by whitespace, so "3.14" or "e.g.x" don't split
+_SENT_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+def _split_sentences(pending: str) -> Tuple[List[str], str]:
+    """
+    Split streamed text into finished sentences and the unfinished remainder.
+    
+    Returns:
+        (complete sentences, remainder) - the list is empty if no sentence has ended yet
+    """
+    sentences = []
+    start = 0
+    for match in _SENT_END.finditer(pending):
+        sentence = pending[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, pending[start:]
+
+
+async def _synthesize_sentence(sentence: str, language: str, use_fast: bool) -> bytes:
+    """Synthesize one sentence off the event loop (returns b"" on failure)"""
+    try:
+        if use_fast:
+            return await get_tts_batcher().submit(sentence, language=language, use_stdout=False)
+        return await asyncio.to_thread(text_to_speech, sentence, language=language)
+    except Exception as e:
+        logger.error(f"TTS error for sentence: {e}")
+        return b""
+
+
+# Recent LLM response times kept per session (bounded for long sessions)
+RESPONSE_TIMES_KEPT = 128
+
+# PCM frames arriving within this window of each other are drained in one pass
+RECEIVE_COALESCE_SECONDS = 0.02
+
+# With VAD, buffered PCM is transcribed if the stream pauses this long (a client
+# that stops sending without trailing silence, or without an empty end frame)
+PCM_FLUSH_SECONDS = 1.0
+
+# Status updates within this window are merged into one frame
+PROGRESS_DEBOUNCE_SECONDS = 0.05
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    """Encode a payload for a JSON text frame"""
+    return json_dumps(payload).decode()
+
+
+# Static frames are encoded once at import
+_MSG_NO_SPEECH = _encode({"status": "No speech detected", "text": ""})
+
+
+class _ProgressSender:
+    """
+    Coalesces per-turn status updates into as few WebSocket frames as possible.
+    Updates are merged into one pending dict (later values win, streamed
+    chunks are concatenated) and sent as a single text frame when the
+    debounce timer fires, or right away before audio and errors.
+    """
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._pending: Dict[str, Any] = {}
+        self._timer: Optional[asyncio.Task] = None
+    
+    def update(self, **fields):
+        """Merge fields into the pending progress frame"""
+        chunk = fields.pop("chunk", None)
+        if chunk is not None:
+            fields["chunk"] = self._pending.get("chunk", "") + chunk
+        self._pending.update(fields)
+        
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        await asyncio.sleep(PROGRESS_DEBOUNCE_SECONDS)
+        self._timer = None
+        try:
+            await self._send()
+        except Exception as e:
+            logger.debug(f"Progress update not sent: {e}")
+    
+    def close(self):
+        """Drop pending progress and stop the debounce timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = {}
+    
+    async def flush(self):
+        """Send any pending progress now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._send()
+    
+    async def _send(self):
+        if not self._pending:
+            return
+        payload, self._pending = self._pending, {}
+        await self.websocket.send_text(_encode(payload))
+    
+    async def send_audio(self, audio: bytes):
+        """Send audio after any pending progress, keeping frames in order"""
+        await self.flush()
+        await self.websocket.send_bytes(audio)
+    
+    async def send_frame(self, frame: str):
+        """Send a pre-encoded JSON frame after any pending progress"""
+        await self.flush()
+        await self.websocket.send_text(frame)
+    
+    async def send_error(self, message: str):
+        """Send an error frame after any pending progress"""
+        await self.send_frame(_encode({"error": message}))
+
+
+async def _send_ready_audio(
+    progress: _ProgressSender,
+    tts_tasks: Deque[asyncio.Task],
+    sent: List[bytes],
+    wait: bool = False
+):
+    """
+    Send synthesized sentences in order, appending each result to sent
+    (including empty ones, so callers can tell the reply is incomplete).
+    Without wait, stops at the first sentence that is still being synthesized.
+    """
+    while tts_tasks and (wait or tts_tasks[0].done()):
+        audio = await tts_tasks.popleft()
+        sent.append(audio)
+        if audio:
+            await progress.send_audio(audio)
+
 
 async def voice_pipeline(websocket: WebSocket):
     await websocket.accept()
@@ -42,11 +227,11 @@ async def voice_pipeline(websocket: WebSocket):
     logger.info(f"Session created: {session.session_id} for user: {session.user_id}")
     
     # Send session info to frontend
-    await websocket.send_json({
+    await websocket.send_text(_encode({
         "status": "Connected",
         "session_id": session.session_id,
         "user_id": session.user_id
-    })
+    }))
     
     # Initialize memory manager for intelligent conversation management
     from app.config.memory_config import MEMORY_CONFIG
@@ -55,168 +240,217 @@ async def voice_pipeline(websocket: WebSocket):
         max_tokens=MEMORY_CONFIG['max_tokens'],
         max_messages=MEMORY_CONFIG['max_messages'],
         summarize_threshold=MEMORY_CONFIG['summarize_threshold'],
-        important_keywords=MEMORY_CONFIG['important_keywords']
+        important_keywords=MEMORY_CONFIG['important_keywords'],
+        defer_summarization=True
     )
+    summary_task: Optional[asyncio.Task] = None  # Background summarization in flight
     
-    # Initialize context analyzer to determine when context is actually needed
-    context_analyzer = ContextAnalyzer()
-    
-    USE_CONVERSATION_HISTORY = True  # Set to False to disable context
+    # Shared context analyzer determines when context is actually needed
+    context_analyzer = get_context_analyzer()
     
-    # Phase 1.2: VAD for streaming mode (optional - can be enabled via config)
-    vad_enabled = False  # Set to True to enable backend VAD
-    vad = SimpleVAD() if vad_enabled else None
+    # Phase 1.2: VAD for streaming mode (optional - enabled with VAD_ENABLED)
+    vad = SimpleVAD() if VAD_ENABLED else None
     
     # Real-time audio processing (optimized for speed)
-    USE_FAST_STT_TTS = True  # Use optimized STT/TTS (no file I/O overhead)
     audio_processor = StreamingAudioProcessor()  # In-memory audio buffering
-    audio_chunks = []  # Accumulate chunks for processing
-    
-    # Phase 1.3: Streaming support (can be enabled)
-    STREAMING_ENABLED = False  # Set to True to enable streaming responses
+    # Raw PCM accumulated in place until end of speech, behind space reserved
+    # for a WAV header so the buffer can be handed to STT without copying
+    audio_buf = bytearray(WAV_HEADER_SIZE)
+    audio_view = None  # memoryview of audio_buf for the utterance in flight
     
     # Phase 1.4: Language support
     current_language = DEFAULT_LANGUAGE  # Will be detected or set by user
     
     # Phase 2: Advanced Features
     # 2.2: Voice Cloning
-    voice_cloning_service = VoiceCloningService()
     user_voice_id = None  # Set if user has cloned voice
     
     # 2.3: Emotion Detection
-    emotion_detector = EmotionDetector()
-    ENABLE_EMOTION_DETECTION = True  # Set to False to disable
+    emotion_detector = get_emotion_detector() if ENABLE_EMOTION_DETECTION else None
     
     # 2.4: Translation
-    translator = Translator()
-    ENABLE_TRANSLATION = False  # Set to True to enable translation
     target_translation_language = None  # Set target language for translation
     
-    # Phase 3: Enterprise Features
-    # 3.1: Analytics
-    analytics = get_analytics()
-    ENABLE_ANALYTICS = True  # Set to False to disable
-    
-    # 3.2: Rate Limiting (already checked at connection)
-    rate_limiter = get_rate_limiter()
-    
-    # 3.3: Webhooks
-    webhook_service = get_webhook_service()
-    ENABLE_WEBHOOKS = False  # Set to True to enable
-    
-    # Phase 4: AI Enhancements
-    # 4.1: Multi-Model Support
-    model_selector = get_model_selector()
-    ENABLE_MODEL_SELECTION = True  # Set to False to disable
-    
-    # 4.2: Tool Use / Function Calling
-    tool_executor = get_tool_executor()
-    ENABLE_TOOLS = False  # Set to True to enable tool use
-    
-    # 4.3: RAG (Retrieval Augmented Generation)
-    rag_service = get_rag_service()
-    ENABLE_RAG = False  # Set to True to enable RAG
-    
     # Track conversation metrics for analytics
     conversation_start_time = time.time()
+    
+    # Status updates are coalesced into one frame per stage transition
+    progress = _ProgressSender(websocket)
     conversation_metrics = {
         'message_count': 0,
         'audio_size': 0,
-        'response_times': []
+        'response_times': deque(maxlen=RESPONSE_TIMES_KEPT)
     }
 
+    pending_chunk = None  # Frame read while draining that starts a new utterance
+    # Per-turn background work, cancelled if the connection ends mid-turn
+    tts_tasks: Deque[asyncio.Task] = deque()
+    emotion_task: Optional[asyncio.Task] = None
+    
     try:
         while True:
             try:
-                logger.info("Waiting for audio data...")
-                audio_chunk = await websocket.receive_bytes()
-                logger.info(f"Received audio chunk: {len(audio_chunk)} bytes")
+                # Raw PCM received but not yet transcribed (VAD is waiting for end of speech)
+                pcm_buffered = audio_view is None and len(audio_buf) > WAV_HEADER_SIZE
+                if pending_chunk is not None:
+                    audio_chunk, pending_chunk = pending_chunk, None
+                elif pcm_buffered:
+                    try:
+                        audio_chunk = await asyncio.wait_for(websocket.receive_bytes(), timeout=PCM_FLUSH_SECONDS)
+                    except asyncio.TimeoutError:
+                        audio_chunk = b""
+                else:
+                    audio_chunk = await websocket.receive_bytes()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Received audio chunk: {len(audio_chunk)} bytes")
                 
                 if not audio_chunk:
-                    logger.warning("Received empty audio chunk")
-                    continue
-                
-                # Real-time audio processing: accumulate chunks
-                audio_chunks.append(audio_chunk)
-                
-                # If VAD is enabled, check for silence
-                if vad_enabled and vad:
-                    if vad.check(audio_chunk):
-                        # Silence detected, process accumulated audio
-                        logger.info("VAD detected speech end, processing accumulated audio")
-                        combined_audio = b''.join(audio_chunks)
-                        audio_chunks.clear()
-                        vad.reset()
-                    else:
-                        # Continue accumulating
+                    if not pcm_buffered:
+                        logger.warning("Received empty audio chunk")
                         continue
+                    # An empty frame or a pause in the stream ends the utterance
+                    logger.info("PCM stream ended, processing accumulated audio")
+                    if vad:
+                        vad.reset()
                 
-                # For now, process when we receive chunks
-                # Frontend should send a stop signal or empty chunk when done
-                # Process accumulated chunks
-                if len(audio_chunks) > 0:
-                    combined_audio = b''.join(audio_chunks)
-                else:
-                    continue
-
-                # Phase 1.4: Language Detection (if enabled)
-                # Only attempt detection if we have enough audio and models are available
-                if AUTO_DETECT_LANGUAGE and len(combined_audio) > 1000:
+                container = detect_container(audio_chunk)
+                if container == "wav":
+                    # Complete WAV utterance (client already cut it with its own VAD)
+                    combined_audio = audio_chunk
+                elif container:
+                    # Complete compressed recording (e.g. the mobile app's .m4a)
                     try:
-                        detected_lang = detect_language(audio_bytes=combined_audio)
-                        if detected_lang and detected_lang != current_language:
-                            current_language = detected_lang
-                            logger.info(f"Language detected: {current_language}")
-                            await websocket.send_json({"status": f"Language: {current_language}"})
+                        combined_audio = await asyncio.to_thread(convert_to_wav, audio_chunk)
                     except Exception as e:
-                        # Silently fail - use default language
-                        logger.debug(f"Language detection skipped: {e}")
-                        pass
-                
+                        logger.error(f"Could not decode {container} audio: {e}")
+                        await progress.send_error(f"Unsupported audio format ({container}), please send WAV or 16 kHz PCM")
+                        continue
+                else:
+                    # Real-time audio processing: raw PCM is accumulated in place
+                    # and transcribed once, when VAD detects the end of speech
+                    if audio_view is not None:
+                        # Previous utterance is done - reuse the allocation
+                        try:
+                            audio_view.release()
+                            del audio_buf[WAV_HEADER_SIZE:]
+                        except BufferError:
+                            # Something still holds the old view; start a fresh buffer
+                            audio_buf = bytearray(WAV_HEADER_SIZE)
+                        audio_view = None
+                    audio_buf.extend(audio_chunk)
+                    if vad and audio_chunk:
+                        speech_ended = vad.check(audio_chunk)
+                        
+                        # Drain frames queued right behind this one without
+                        # another trip through the outer loop
+                        while not speech_ended:
+                            try:
+                                more = await asyncio.wait_for(websocket.receive_bytes(), timeout=RECEIVE_COALESCE_SECONDS)
+                            except asyncio.TimeoutError:
+                                break
+                            if not more:
+                                # Empty frame: the client marks the end of the utterance
+                                speech_ended = True
+                                break
+                            if detect_container(more):
+                                pending_chunk = more
+                                break
+                            audio_buf.extend(more)
+                            speech_ended = vad.check(more)
+                        
+                        if not speech_ended:
+                            # Continue accumulating
+                            continue
+                        logger.info("VAD detected speech end, processing accumulated audio")
+                        vad.reset()
+                    
+                    write_wav_header(audio_buf)
+                    audio_view = memoryview(audio_buf)
+                    combined_audio = audio_view
+
                 # Speech to text (optimized - no file I/O)
                 try:
                     logger.info("Starting fast speech-to-text conversion...")
-                    await websocket.send_json({"status": "Converting speech to text..."})
+                    progress.update(status="Converting speech to text...", stage="stt")
                     
-                    if USE_FAST_STT_TTS:
+                    # Phase 1.4: Language Detection (if enabled)
+                    # Until the session's language is locked, utterances with enough
+                    # audio (~0.5s) are transcribed with whisper's auto-detection, so
+                    # the language comes from the STT pass instead of a second run
+                    text = None
+                    if AUTO_DETECT_LANGUAGE and not session.language_locked and len(combined_audio) > LANGUAGE_DETECT_MIN_BYTES:
+                        try:
+                            text, detected = await get_stt_detect_batcher().submit(combined_audio)
+                        except Exception as e:
+                            # e.g. no multilingual model - transcribe in the current language
+                            logger.debug(f"Language detection skipped: {e}")
+                        else:
+                            detected_lang, confidence = detected or (None, 0.0)
+                            # Only a confident result for a language we can answer in
+                            # switches (and locks) the session's language
+                            if confidence > LANGUAGE_LOCK_CONFIDENCE and is_language_supported(detected_lang):
+                                session.language_locked = True
+                                logger.info(f"Language locked for session: {detected_lang} ({confidence:.2f})")
+                                if detected_lang != current_language:
+                                    current_language = detected_lang
+                                    logger.info(f"Language detected: {current_language}")
+                                    progress.update(status=f"Language: {current_language}")
+                    
+                    if text is None and USE_FAST_STT_TTS:
                         # Use fast STT (in-memory processing)
-                        text = speech_to_text_fast(combined_audio, language=current_language, use_stdin=False)
-                    else:
+                        # Shared batcher bounds concurrent whisper runs across sessions
+                        text = await get_stt_batcher().submit(
+                            combined_audio, language=current_language, use_stdin=False
+                        )
+                    elif text is None:
                         # Fallback to regular STT
-                        text = speech_to_text(combined_audio, language=current_language)
+                        text = await asyncio.to_thread(speech_to_text, combined_audio, language=current_language)
                     
                     logger.info(f"USER ({current_language}): {text}")
                     
-                    # Clear chunks after processing
-                    audio_chunks.clear()
-                    
                     if not text or not text.strip():
                         logger.warning("No speech detected in audio")
-                        await websocket.send_json({"status": "No speech detected", "text": ""})
+                        await progress.send_frame(_MSG_NO_SPEECH)
                         continue
                     
                     # Send transcript back to frontend
-                    await websocket.send_json({"status": "Processing with AI...", "text": text})
+                    progress.update(status="Processing with AI...", stage="llm", text=text)
                 except Exception as e:
                     logger.error(f"STT error: {e}", exc_info=True)
-                    await websocket.send_json({"error": f"Speech recognition failed: {str(e)}"})
+                    await progress.send_error(f"Speech recognition failed: {str(e)}")
                     continue
 
+                # Sentence audio synthesized while the LLM is still streaming
+                tts_tasks = deque()
+                sent_audio: List[bytes] = []
+                cached = None
+                cache_query = None
+                
                 # LLM processing
                 try:
                     logger.info("Processing with LLM...")
                     
+                    # Phase 2.3: Emotion detection runs in a worker thread while
+                    # context is analyzed below
+                    emotion_task = None
+                    if ENABLE_EMOTION_DETECTION:
+                        emotion_task = asyncio.create_task(asyncio.to_thread(
+                            emotion_detector.detect_emotion, text=text, audio_bytes=combined_audio
+                        ))
+                    
                     # Determine if context is actually needed (smart context selection)
                     context = None
                     if USE_CONVERSATION_HISTORY:
-                        # Get full history from memory
-                        full_history = memory.get_context(max_tokens=2000)
+                        # Only questions with reference/follow-up words are analyzed;
+                        # get_relevant_context returns None when no context is needed
+                        if _maybe_needs_context(text):
+                            full_history = memory.get_context(max_tokens=2000)
+                            context = await asyncio.to_thread(
+                                context_analyzer.get_relevant_context, text, full_history, max_messages=2
+                            )
                         
-                        # Analyze if current question actually needs context
-                        if context_analyzer.needs_context(text, full_history):
-                            # Get only relevant context (not full history)
-                            context = context_analyzer.get_relevant_context(text, full_history, max_messages=2)
-                            logger.info(f"Context needed - including {len(context) if context else 0} relevant messages")
+                        if context:
+                            logger.info(f"Context needed - including {len(context)} relevant messages")
                         else:
                             # Standalone question - no context needed
                             context = None
@@ -229,35 +463,30 @@ async def voice_pipeline(websocket: WebSocket):
                     
                     # Phase 2.3: Adjust LLM prompt based on emotion
                     emotion_context = ""
-                    emotion_result = None  # Initialize
                     if ENABLE_EMOTION_DETECTION:
                         try:
-                            emotion_result = emotion_detector.detect_emotion(text=text, audio_bytes=combined_audio)
-                            logger.info(f"Emotion detected: {emotion_result.get('primary', {}).get('emotion', 'unknown')}")
-                            await websocket.send_json({
-                                "status": "Emotion detected",
-                                "emotion": emotion_result.get('primary', {}).get('emotion', 'neutral'),
-                                "sentiment": emotion_result.get('primary', {}).get('sentiment', 'neutral')
-                            })
+                            primary = (await emotion_task).get('primary', {})
+                            emotion = primary.get('emotion', 'neutral')
+                            sentiment = primary.get('sentiment', 'neutral')
+                            suggestions = primary.get('suggestions', {})
+                            logger.info(f"Emotion detected: {emotion}")
+                            progress.update(status="Emotion detected", emotion=emotion, sentiment=sentiment)
+                            
+                            emotion_context = _emotion_context(
+                                emotion,
+                                sentiment,
+                                suggestions.get('tone', 'neutral'),
+                                suggestions.get('style', 'professional'),
+                                suggestions.get('empathy', False)
+                            )
                         except Exception as e:
                             logger.warning(f"Emotion detection failed: {e}")
                     
-                    if ENABLE_EMOTION_DETECTION and emotion_result:
-                        primary = emotion_result.get('primary', {})
-                        emotion = primary.get('emotion', 'neutral')
-                        sentiment = primary.get('sentiment', 'neutral')
-                        suggestions = primary.get('suggestions', {})
-                        
-                        if emotion != 'neutral' or sentiment != 'neutral':
-                            emotion_context = f"\n\nUser's emotional state: {emotion} ({sentiment}). "
-                            emotion_context += f"Respond with a {suggestions.get('tone', 'neutral')} tone and {suggestions.get('style', 'professional')} style."
-                            if suggestions.get('empathy', False):
-                                emotion_context += " Show empathy and understanding."
-                    
                     # Phase 4.2: Check for tool use
                     tool_result = None
                     if ENABLE_TOOLS:
-                        tool_result = tool_executor.auto_detect_and_execute(text)
+                        from app.services.tool_executor import get_tool_executor
+                        tool_result = await asyncio.to_thread(get_tool_executor().auto_detect_and_execute, text)
                         if tool_result and tool_result.get('success'):
                             # Include tool result in prompt
                             tool_info = f"\n\nTool result ({tool_result.get('tool', 'unknown')}): {tool_result}"
@@ -267,45 +496,82 @@ async def voice_pipeline(websocket: WebSocket):
                     # Phase 4.3: Retrieve RAG context
                     rag_context = []
                     if ENABLE_RAG:
-                        rag_context = rag_service.retrieve_context(text, max_results=3)
+                        from app.services.rag import get_rag_service
+                        rag_context = await asyncio.to_thread(get_rag_service().retrieve_context, text, max_results=3)
                         if rag_context:
                             logger.info(f"Retrieved {len(rag_context)} RAG contexts")
                     
                     # Phase 4.1: Select model based on use case
                     selected_model = None
                     if ENABLE_MODEL_SELECTION:
-                        selected_model = model_selector.select_model(text=text)
+                        selected_model = get_model_selector().select_model(text=text)
                         logger.info(f"Selected model: {selected_model}")
                     
+                    # Phase 4.4: Look up a cached reply (not when a tool ran - its
+                    # result is live data)
+                    if ENABLE_RESPONSE_CACHE and not (tool_result and tool_result.get('success')):
+                        response_cache = get_response_cache()
+                        cache_query = await asyncio.to_thread(response_cache.make_key, text)
+                        cache_fingerprint = response_cache.fingerprint(
+                            context, current_language, emotion_context, rag_context,
+                            scope=session.user_id
+                        )
+                        cached = response_cache.lookup(cache_query, cache_fingerprint)
+                    
                     # Phase 3.1: Track performance - LLM start
-                    llm_start_time = time.time()
+                    llm_start_ns = time.perf_counter_ns()
                     
                     # Phase 1.3: Streaming or regular LLM response
                     reply = ""
-                    if STREAMING_ENABLED:
+                    if cached:
+                        reply = cached[0]
+                        logger.info("Response cache hit - skipping LLM and TTS")
+                    elif STREAMING_ENABLED:
                         # Stream response word-by-word
                         from app.services.streaming_llm import stream_llm_response
                         logger.info("Streaming LLM response...")
-                        await websocket.send_json({"status": "Streaming response...", "streaming": True})
+                        progress.update(status="Streaming response...", streaming=True)
                         
                         # Add emotion context to text if available
                         text_for_llm = text + emotion_context if emotion_context else text
-                        async for chunk in stream_llm_response(text_for_llm, context):
+                        pending = ""
+                        async for chunk in stream_llm_response(
+                            text_for_llm,
+                            context,
+                            model=selected_model,
+                            rag_context=rag_context if rag_context else None
+                        ):
                             reply += chunk
                             # Send each chunk to frontend
-                            await websocket.send_json({
-                                "status": "streaming",
-                                "chunk": chunk,
-                                "partial_response": reply
-                            })
+                            progress.update(status="streaming", chunk=chunk, partial_response=reply)
+                            
+                            # Start speech for each finished sentence right away
+                            pending += chunk
+                            sentences, pending = _split_sentences(pending)
+                            for sentence in sentences:
+                                # Same post-processing as non-streaming replies
+                                sentence = clean_response(sentence)
+                                if sentence:
+                                    tts_tasks.append(asyncio.create_task(
+                                        _synthesize_sentence(sentence, current_language, USE_FAST_STT_TTS)
+                                    ))
+                            await _send_ready_audio(progress, tts_tasks, sent_audio)
+                        
+                        pending = clean_response(pending)
+                        if pending:
+                            tts_tasks.append(asyncio.create_task(
+                                _synthesize_sentence(pending, current_language, USE_FAST_STT_TTS)
+                            ))
                         
-                        await websocket.send_json({"status": "Streaming complete", "streaming": False})
+                        reply = clean_response(reply)
+                        progress.update(status="Streaming complete", streaming=False)
                     else:
                         # Regular (non-streaming) response
                         # Add emotion context to prompt if available
                         text_with_emotion = text + emotion_context if emotion_context else text
                         # Phase 4: Enhanced LLM call with model selection and RAG
-                        reply = chat_with_llm(
+                        reply = await asyncio.to_thread(
+                            chat_with_llm,
                             text_with_emotion,
                             context,
                             model_preference=selected_model,
@@ -314,9 +580,9 @@ async def voice_pipeline(websocket: WebSocket):
                         )
                     
                     # Phase 3.1: Track LLM performance
-                    llm_duration = time.time() - llm_start_time
-                    if analytics:
-                        analytics.track_performance('llm', llm_duration, session.session_id)
+                    llm_duration = (time.perf_counter_ns() - llm_start_ns) / 1e9
+                    if ENABLE_ANALYTICS:
+                        get_analytics().track_performance('llm', llm_duration, session.session_id)
                         conversation_metrics['response_times'].append(llm_duration)
                     
                     logger.info(f"BOT: {reply}")
@@ -325,67 +591,91 @@ async def voice_pipeline(websocket: WebSocket):
                     session.increment_conversation()
                     conversation_metrics['message_count'] += 1
                     
-                    # Phase 3.3: Send webhook for message
-                    if webhook_service.enabled:
-                        await webhook_service.send_webhook('message', {
-                            'session_id': session.session_id,
-                            'user_id': session.user_id,
-                            'user_message': text,
-                            'assistant_message': reply,
-                            'timestamp': time.time()
-                        })
+                    # Phase 3.3: Send webhook for message (only queued here;
+                    # delivery runs on the webhook service's background worker)
+                    if ENABLE_WEBHOOKS:
+                        from app.services.webhook import get_webhook_service
+                        webhook_service = get_webhook_service()
+                        if webhook_service.has_subscribers('message'):
+                            await webhook_service.send_webhook('message', {
+                                'session_id': session.session_id,
+                                'user_id': session.user_id,
+                                'user_message': text,
+                                'assistant_message': reply,
+                                'timestamp': time.time()
+                            })
                     
                     # Store assistant response in memory
                     if USE_CONVERSATION_HISTORY:
                         memory.add_message("assistant", reply)
                         logger.info(f"Updated memory: {memory.get_stats()}")
+                        # Summarize between turns instead of inside this one
+                        if memory.needs_summary() and (summary_task is None or summary_task.done()):
+                            summary_task = asyncio.create_task(memory.summarize_async())
                 except Exception as e:
+                    for task in tts_tasks:
+                        task.cancel()
                     logger.error(f"LLM error: {e}", exc_info=True)
-                    await websocket.send_json({"error": f"LLM processing failed: {str(e)}"})
+                    await progress.send_error(f"LLM processing failed: {str(e)}")
                     continue
 
                 # Send response text before audio
-                await websocket.send_json({"status": "Generating speech...", "response": reply})
+                progress.update(status="Generating speech...", stage="tts", response=reply)
                 
                 # Text to speech with language support (optimized - no file I/O)
                 try:
+                    if cached:
+                        for audio in cached[1]:
+                            await progress.send_audio(audio)
+                        logger.info("Cached audio response sent successfully")
+                        continue
+                    
+                    if STREAMING_ENABLED:
+                        # Sentences were queued during streaming; send the rest in order
+                        await _send_ready_audio(progress, tts_tasks, sent_audio, wait=True)
+                        logger.info("Streamed audio response sent successfully")
+                        if cache_query is not None:
+                            response_cache.store(cache_query, cache_fingerprint, reply, sent_audio)
+                        continue
+                    
                     logger.info("Generating speech (fast mode)...")
                     
                     if USE_FAST_STT_TTS:
                         # Use fast TTS (in-memory processing)
-                        audio_reply = text_to_speech_fast(reply, language=current_language, use_stdout=False)
+                        audio_reply = await get_tts_batcher().submit(reply, language=current_language, use_stdout=False)
                     else:
                         # Fallback to regular TTS
-                        audio_reply = text_to_speech(reply, language=current_language)
+                        audio_reply = await asyncio.to_thread(text_to_speech, reply, language=current_language)
                     
                     logger.info(f"Sending audio response: {len(audio_reply)} bytes")
-                    await websocket.send_bytes(audio_reply)
+                    await progress.send_audio(audio_reply)
                     logger.info("Audio response sent successfully")
+                    if cache_query is not None:
+                        response_cache.store(cache_query, cache_fingerprint, reply, [audio_reply])
                 except Exception as e:
                     logger.error(f"TTS error: {e}", exc_info=True)
-                    await websocket.send_json({"error": f"Text-to-speech failed: {str(e)}"})
+                    await progress.send_error(f"Text-to-speech failed: {str(e)}")
                     continue
 
             except WebSocketDisconnect:
                 logger.info("WebSocket disconnected")
-                # Cleanup session
-                _session_manager.remove_session(session.session_id)
                 break
             except Exception as e:
                 logger.error(f"Pipeline error: {e}")
                 try:
-                    await websocket.send_json({"error": str(e)})
+                    await websocket.send_text(_encode({"error": str(e)}))
                 except:
                     pass
                 break
 
     except WebSocketDisconnect:
         logger.info("WebSocket connection closed")
-        # Cleanup session
-        if 'session' in locals():
-            _session_manager.remove_session(session.session_id)
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        # Cleanup session on error
-        if 'session' in locals():
-            _session_manager.remove_session(session.session_id)
\ No newline at end of file
+    finally:
+        # Stop work still running for this session, then release it
+        for task in (*tts_tasks, emotion_task, summary_task):
+            if task is not None and not task.done():
+                task.cancel()
+        progress.close()
+        _session_manager.remove_session(session.session_id)
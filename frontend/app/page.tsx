@@ -23,6 +23,8 @@ export default function Home() {
   const mediaRecorderRef = useRef<any>(null) // Stores processor, stream, source
   const audioContextRef = useRef<AudioContext | null>(null)
   const audioRef = useRef<HTMLAudioElement | null>(null)
+  const audioQueueRef = useRef<Blob[]>([]) // Sentence audio waiting to play
+  const isPlayingRef = useRef<boolean>(false)
   const audioChunksRef = useRef<Float32Array[]>([])
   const timerIntervalRef = useRef<NodeJS.Timeout | null>(null)
   const isRecordingRef = useRef<boolean>(false)
@@ -82,6 +84,28 @@ export default function Home() {
       console.log('WebSocket connected')
     }
     
+    const playNextAudio = async () => {
+      const next = audioQueueRef.current.shift()
+      if (!next || !audioRef.current) {
+        isPlayingRef.current = false
+        setStatus(isConnected ? 'Connected' : 'Disconnected')
+        return
+      }
+      
+      isPlayingRef.current = true
+      const audioUrl = URL.createObjectURL(next)
+      audioRef.current.src = audioUrl
+      audioRef.current.onended = () => {
+        URL.revokeObjectURL(audioUrl)
+        playNextAudio()
+      }
+      await audioRef.current.play().catch((e) => {
+        console.error(e)
+        URL.revokeObjectURL(audioUrl)
+        playNextAudio()
+      })
+    }
+    
     ws.onmessage = async (event) => {
       // Handle session info from backend
       if (typeof event.data === 'string') {
@@ -106,14 +130,10 @@ export default function Home() {
         setIsProcessing(false)
         setStatus('Playing response...')
         
-        const audioUrl = URL.createObjectURL(event.data)
-        if (audioRef.current) {
-          audioRef.current.src = audioUrl
-          audioRef.current.onended = () => {
-            setStatus(isConnected ? 'Connected' : 'Disconnected')
-            URL.revokeObjectURL(audioUrl)
-          }
-          await audioRef.current.play().catch(console.error)
+        // Streamed replies arrive as one blob per sentence - play them in order
+        audioQueueRef.current.push(event.data)
+        if (!isPlayingRef.current) {
+          await playNextAudio()
         }
       } else if (typeof event.data === 'string') {
         // JSON response (error or status)
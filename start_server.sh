@@ -11,5 +11,5 @@ echo ""
 echo "Press Ctrl+C to stop"
 echo ""
 
-uvicorn app.main:app --host 0.0.0.0 --port 8009 --reload
+uvicorn app.main:app --host 0.0.0.0 --port 8009 --reload --loop uvloop --http httptools --ws websockets
 
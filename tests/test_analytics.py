@@ -0,0 +1,23 @@
+"""Tests for analytics persistence in app.services.analytics"""
+import json
+import threading
+
+from app.services import analytics
+
+
+def test_concurrent_saves_leave_valid_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "ANALYTICS_DIR", tmp_path)
+    service = analytics.AnalyticsService()
+    
+    def save(n):
+        service._write_analytics({'conversations': n, 'performance_log': list(range(2000))})
+    
+    threads = [threading.Thread(target=save, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    data = json.loads((tmp_path / "analytics.json").read_text())
+    assert data['conversations'] in range(8)
+    assert [p.name for p in tmp_path.iterdir()] == ["analytics.json"]
@@ -0,0 +1,40 @@
+"""Tests for audio format handling in app.services.audio_buffer"""
+import struct
+
+import pytest
+
+from app.services import audio_buffer
+from app.services.audio_buffer import WAV_HEADER_SIZE, convert_to_wav, detect_container, write_wav_header
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+    (b"\x00\x00\x00\x1cftypM4A \x00\x00", "mp4"),
+    (b"OggS\x00\x02\x00\x00\x00\x00\x00\x00", "ogg"),
+    (b"\x1aE\xdf\xa3\x9fB\x86\x81\x01B\xf7\x81", "webm"),
+    (b"fLaC\x00\x00\x00\x22\x10\x00\x10\x00", "flac"),
+    (b"ID3\x04\x00\x00\x00\x00\x00\x00\x00\x00", "mp3"),
+])
+def test_detect_container(head, expected):
+    assert detect_container(head) == expected
+
+
+def test_raw_pcm_is_not_a_container():
+    # Samples of -1 (0xFFFF) look like an MP3 frame sync, so they must stay PCM
+    assert detect_container(struct.pack("<6h", -1, -1, 0, 1, -2, 3)) is None
+    assert detect_container(memoryview(bytes(12))) is None
+
+
+def test_write_wav_header_in_place():
+    buf = bytearray(WAV_HEADER_SIZE) + bytearray(b"\x01\x00" * 8)
+    write_wav_header(buf)
+    
+    assert detect_container(buf) == "wav"
+    assert struct.unpack_from("<I", buf, 40)[0] == 16
+
+
+def test_convert_without_ffmpeg_raises(monkeypatch):
+    monkeypatch.setattr(audio_buffer.shutil, "which", lambda name: None)
+    
+    with pytest.raises(RuntimeError):
+        convert_to_wav(b"\x00\x00\x00\x1cftypM4A ")
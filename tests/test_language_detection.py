@@ -0,0 +1,69 @@
+"""Tests for language detection from the STT pass (app.services.fast_stt)"""
+import subprocess
+
+import pytest
+
+from app.services import fast_stt
+from app.services.language_detector import parse_detected_language
+
+
+def _completed(returncode=0, stdout=b"", stderr=b""):
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+def test_parse_detected_language():
+    log = b"whisper_full_with_state: auto-detected language: es (p = 0.973541)\n"
+    
+    assert parse_detected_language(log) == ("es", pytest.approx(0.973541))
+    assert parse_detected_language(b"no detection here") is None
+    assert parse_detected_language(None) is None
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Pretend whisper-cli and the multilingual model exist; record each run"""
+    monkeypatch.setattr(fast_stt.os.path, "exists", lambda path: True)
+    calls = []
+    results = []
+    
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        return results.pop(0)
+    
+    monkeypatch.setattr(fast_stt.subprocess, "run", run)
+    return calls, results
+
+
+def test_single_pass_returns_text_and_language(runs):
+    calls, results = runs
+    results.append(_completed(stdout=b" hola mundo\n", stderr=b"auto-detected language: es (p = 0.95)"))
+    
+    assert fast_stt.speech_to_text_detect(b"RIFF....") == ("hola mundo", ("es", 0.95))
+    assert len(calls) == 1
+    assert calls[0][calls[0].index("--language") + 1] == "auto"
+    assert "-otxt" not in calls[0]
+
+
+def test_unreadable_stdin_falls_back_to_temp_file(runs):
+    calls, results = runs
+    results.append(_completed(stderr=b"error: failed to read audio data"))
+    results.append(_completed(stdout=b"hello", stderr=b"auto-detected language: en (p = 0.99)"))
+    
+    assert fast_stt.speech_to_text_detect(b"RIFF....") == ("hello", ("en", 0.99))
+    assert calls[0][-1] == "-"
+    assert calls[1][-1].endswith(".wav")
+
+
+def test_missing_detection_line_returns_no_language(runs):
+    calls, results = runs
+    results.append(_completed(stdout=b"hello"))
+    
+    assert fast_stt.speech_to_text_detect(b"RIFF....") == ("hello", None)
+
+
+def test_whisper_failure_raises(runs):
+    calls, results = runs
+    results.append(_completed(returncode=1, stderr=b"boom"))
+    
+    with pytest.raises(RuntimeError):
+        fast_stt.speech_to_text_detect(b"RIFF....", use_stdin=False)
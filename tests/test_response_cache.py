@@ -0,0 +1,95 @@
+"""Tests for the reply cache in app.services.response_cache"""
+import pytest
+
+from app.services import response_cache
+from app.services.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache():
+    """Exact-match cache (no embedding model)"""
+    return ResponseCache(max_entries=8, use_embeddings=False)
+
+
+def _fp(scope="user_a", context=None):
+    return ResponseCache.fingerprint(context, "en", scope=scope)
+
+
+def test_exact_repeat_hits_after_normalization(cache):
+    cache.store(cache.make_key("What's the weather?"), _fp(), "Sunny.", [b"audio"])
+    
+    assert cache.lookup(cache.make_key("  what's the WEATHER "), _fp()) == ("Sunny.", [b"audio"])
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("Is the water safe to drink", "Is the water not safe to drink"),
+    ("Convert 100 dollars to yen", "Convert 100 euros to yen"),
+    ("How big is a crocodile", "How big is an alligator"),
+])
+def test_near_miss_questions_do_not_hit(cache, stored, asked):
+    cache.store(cache.make_key(stored), _fp(), "cached answer", [b"audio"])
+    
+    assert cache.lookup(cache.make_key(asked), _fp()) is None
+
+
+def test_entries_do_not_cross_users(cache):
+    cache.store(cache.make_key("what is my name"), _fp("user_a"), "Alice.", [b"audio"])
+    
+    assert cache.lookup(cache.make_key("what is my name"), _fp("user_b")) is None
+
+
+def test_entries_do_not_cross_conversation_state(cache):
+    context = [{"role": "user", "content": "Tell me about Paris"}]
+    cache.store(cache.make_key("how old is it"), _fp(context=context), "Very old.", [b"audio"])
+    
+    assert cache.lookup(cache.make_key("how old is it"), _fp()) is None
+
+
+def test_partial_audio_is_not_stored(cache):
+    cache.store(cache.make_key("hello"), _fp(), "Hi. How are you?", [b"hi", b""])
+    
+    assert cache.lookup(cache.make_key("hello"), _fp()) is None
+
+
+def test_expired_entries_miss(cache, monkeypatch):
+    cache.store(cache.make_key("hello"), _fp(), "Hi.", [b"audio"])
+    later = response_cache._now() + response_cache.ENTRY_TTL_SECONDS + 1
+    monkeypatch.setattr(response_cache, "_now", lambda: later)
+    
+    assert cache.lookup(cache.make_key("hello"), _fp()) is None
+
+
+def test_audio_budget_evicts_oldest_entries():
+    cache = ResponseCache(max_entries=8, max_audio_bytes=10, use_embeddings=False)
+    for i in range(3):
+        cache.store(cache.make_key(f"question {i}"), _fp(), f"answer {i}", [b"x" * 4])
+    
+    assert cache.lookup(cache.make_key("question 0"), _fp()) is None
+    assert cache.lookup(cache.make_key("question 1"), _fp()) == ("answer 1", [b"x" * 4])
+    assert cache.lookup(cache.make_key("question 2"), _fp()) == ("answer 2", [b"x" * 4])
+    assert cache.get_stats()["audio_bytes"] == 8
+
+
+def test_oversized_reply_is_not_stored():
+    cache = ResponseCache(max_entries=8, max_audio_bytes=10, use_embeddings=False)
+    cache.store(cache.make_key("long"), _fp(), "answer", [b"x" * 11])
+    
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_ring_overwrites_oldest_entry():
+    cache = ResponseCache(max_entries=2, use_embeddings=False)
+    for i in range(3):
+        cache.store(cache.make_key(f"question {i}"), _fp(), f"answer {i}", [b"audio"])
+    
+    assert cache.lookup(cache.make_key("question 0"), _fp()) is None
+    assert cache.lookup(cache.make_key("question 2"), _fp()) == ("answer 2", [b"audio"])
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_restoring_a_question_replaces_it(cache):
+    cache.store(cache.make_key("hello"), _fp(), "Hi.", [b"one"])
+    cache.store(cache.make_key("hello"), _fp(), "Hello!", [b"two"])
+    
+    assert cache.lookup(cache.make_key("hello"), _fp()) == ("Hello!", [b"two"])
+    assert cache.get_stats() == {'entries': 1, 'audio_bytes': 3, 'hits': 1, 'misses': 0}
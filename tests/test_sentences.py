@@ -0,0 +1,41 @@
+"""Tests for sentence splitting of streamed LLM text in app.ws"""
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.ws import _split_sentences
+
+
+def test_splits_finished_sentences_and_keeps_remainder():
+    assert _split_sentences("Hello there. How are") == (["Hello there."], "How are")
+
+
+def test_no_sentence_end_yet():
+    assert _split_sentences("Hello there") == ([], "Hello there")
+
+
+def test_final_punctuation_waits_for_more_text():
+    # The next chunk may continue it (e.g. "Done." then ".." or "3." then "5")
+    assert _split_sentences("Done.") == ([], "Done.")
+
+
+def test_multiple_sentences_and_punctuation_runs():
+    sentences, rest = _split_sentences("Really?! Yes... Okay! ")
+    
+    assert sentences == ["Really?!", "Yes...", "Okay!"]
+    assert rest == ""
+
+
+def test_closing_quotes_and_brackets_stay_with_sentence():
+    sentences, rest = _split_sentences('He said "hi." (Then left.) And')
+    
+    assert sentences == ['He said "hi."', "(Then left.)"]
+    assert rest == "And"
+
+
+def test_decimals_do_not_split():
+    assert _split_sentences("It costs 3.50 dollars") == ([], "It costs 3.50 dollars")
+
+
+def test_newlines_end_sentences():
+    assert _split_sentences("First.\nSecond.\n") == (["First.", "Second."], "")
@@ -0,0 +1,160 @@
+"""Tests for the whisper.cpp STT fallbacks in app.stt"""
+import subprocess
+
+import pytest
+import requests
+
+from app import stt
+
+
+def _completed(returncode=0, stdout=b"", stderr=b""):
+    return subprocess.CompletedProcess(args=[], returncode=returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    """Pretend whisper-cli and its models exist, with no whisper-server"""
+    monkeypatch.setattr(stt.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(stt, "_get_server_url", lambda model_path: None)
+    monkeypatch.setattr(stt, "_server_failures", {})
+    calls = {"run": [], "file": []}
+    
+    def via_file(audio_bytes, model_path, lang_args):
+        calls["file"].append(audio_bytes)
+        return "from file"
+    
+    monkeypatch.setattr(stt, "_speech_to_text_via_file", via_file)
+    return calls
+
+
+def _fake_run(calls, result):
+    def run(cmd, **kwargs):
+        calls["run"].append(kwargs)
+        return result
+    return run
+
+
+def test_stdin_success_returns_stdout(cli, monkeypatch):
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, _completed(stdout=b" hello world \n")))
+    
+    assert stt.speech_to_text(b"RIFF....") == "hello world"
+    assert cli["file"] == []
+
+
+def test_stdin_call_always_captures_stderr(cli, monkeypatch):
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, _completed(stdout=b"hi")))
+    
+    stt.speech_to_text(b"RIFF....")
+    assert cli["run"][0]["stderr"] == subprocess.PIPE
+
+
+def test_unreadable_stdin_with_exit_zero_falls_back_to_file(cli, monkeypatch):
+    result = _completed(stderr=b"error: failed to read audio data from stdin")
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, result))
+    
+    assert stt.speech_to_text(b"RIFF....") == "from file"
+    assert cli["file"] == [b"RIFF...."]
+
+
+def test_nonzero_exit_falls_back_to_file(cli, monkeypatch):
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, _completed(returncode=1)))
+    
+    assert stt.speech_to_text(b"RIFF....") == "from file"
+
+
+def test_silence_is_not_retried_via_file(cli, monkeypatch):
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, _completed(stdout=b"")))
+    
+    assert stt.speech_to_text(b"RIFF....") == ""
+    assert cli["file"] == []
+
+
+def test_server_failure_falls_back_to_cli(cli, monkeypatch):
+    monkeypatch.setattr(stt, "_get_server_url", lambda model_path: "http://127.0.0.1:1")
+    
+    def broken_server(url, audio_bytes, lang_args):
+        raise requests.ConnectionError("refused")
+    
+    monkeypatch.setattr(stt, "_transcribe_via_server", broken_server)
+    monkeypatch.setattr(stt.subprocess, "run", _fake_run(cli, _completed(stdout=b"cli text")))
+    
+    assert stt.speech_to_text(b"RIFF....") == "cli text"
+
+
+def test_empty_audio_is_rejected(cli):
+    with pytest.raises(ValueError):
+        stt.speech_to_text(b"")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fresh daemon state with a fake _start_server"""
+    monkeypatch.setattr(stt.os.path, "exists", lambda path: True)
+    monkeypatch.setattr(stt, "_servers", {})
+    monkeypatch.setattr(stt, "_server_failures", {})
+    monkeypatch.setattr(stt, "_start_locks", {})
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(stt.time, "monotonic", lambda: clock["now"])
+    starts = []
+    
+    def start(model_path):
+        starts.append(model_path)
+        return None
+    
+    monkeypatch.setattr(stt, "_start_server", start)
+    return starts, clock
+
+
+def test_failed_start_is_not_retried_until_backoff_expires(server):
+    starts, clock = server
+    
+    assert stt._get_server_url("model.bin") is None
+    assert stt._get_server_url("model.bin") is None
+    assert starts == ["model.bin"]
+    
+    clock["now"] += stt.SERVER_RETRY_BASE_SECONDS
+    assert stt._get_server_url("model.bin") is None
+    assert starts == ["model.bin", "model.bin"]
+
+
+def test_backoff_grows_and_is_capped(server):
+    starts, clock = server
+    
+    for _ in range(12):
+        stt._get_server_url("model.bin")
+        clock["now"] += stt.SERVER_RETRY_MAX_SECONDS
+    
+    fails, retry_at = stt._server_failures["model.bin"]
+    assert fails == 12
+    assert retry_at - (clock["now"] - stt.SERVER_RETRY_MAX_SECONDS) == stt.SERVER_RETRY_MAX_SECONDS
+
+
+def test_failure_backoff_is_per_model(server):
+    starts, clock = server
+    
+    stt._get_server_url("a.bin")
+    stt._get_server_url("b.bin")
+    assert starts == ["a.bin", "b.bin"]
+
+
+def test_caller_does_not_wait_for_a_starting_daemon(server):
+    starts, clock = server
+    stt._start_locks["model.bin"] = lock = stt.threading.Lock()
+    lock.acquire()
+    
+    assert stt._get_server_url("model.bin") is None
+    assert starts == []
+
+
+def test_successful_start_clears_failures(server, monkeypatch):
+    starts, clock = server
+    stt._get_server_url("model.bin")
+    clock["now"] += stt.SERVER_RETRY_BASE_SECONDS
+    
+    class Proc:
+        def poll(self):
+            return None
+    
+    monkeypatch.setattr(stt, "_start_server", lambda model_path: (Proc(), "http://127.0.0.1:9"))
+    assert stt._get_server_url("model.bin") == "http://127.0.0.1:9"
+    assert "model.bin" not in stt._server_failures
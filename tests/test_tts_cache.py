@@ -0,0 +1,83 @@
+"""Tests for the synthesized speech cache in app.services.tts_cache"""
+import os
+
+from app.services.tts_cache import TTSCache
+
+
+def _files(cache_dir):
+    return sorted(p.name for p in cache_dir.iterdir())
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path, max_entries=2)
+    cache.put("voice", "en", "one", b"1")
+    cache.put("voice", "en", "two", b"2")
+    cache.get("voice", "en", "one")
+    cache.put("voice", "en", "three", b"3")
+    
+    assert list(cache._memory) == [cache.make_key("voice", "en", "one"), cache.make_key("voice", "en", "three")]
+
+
+def test_disk_tier_is_capped_by_size(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path, max_entries=1, max_disk_bytes=10)
+    for text in ("one", "two", "three"):
+        cache.put("voice", "en", text, b"x" * 4)
+    
+    assert cache.get_stats()["disk_bytes"] == 8
+    assert _files(tmp_path) == sorted(
+        f"{cache.make_key('voice', 'en', text)}.wav" for text in ("two", "three")
+    )
+
+
+def test_disk_hit_refreshes_recency(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path, max_entries=1, max_disk_bytes=10)
+    cache.put("voice", "en", "one", b"x" * 4)
+    cache.put("voice", "en", "two", b"x" * 4)
+    # "one" is only on disk now (the memory tier holds one entry)
+    assert cache.get("voice", "en", "one") == b"x" * 4
+    cache.put("voice", "en", "three", b"x" * 4)
+    
+    assert cache.get("voice", "en", "one") == b"x" * 4
+    assert not (tmp_path / f"{cache.make_key('voice', 'en', 'two')}.wav").exists()
+
+
+def test_rewriting_an_entry_is_counted_once(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path, max_entries=1)
+    cache.put("voice", "en", "one", b"x" * 4)
+    cache.put("voice", "en", "one", b"x" * 4)
+    
+    assert cache.get_stats()["disk_entries"] == 1
+    assert cache.get_stats()["disk_bytes"] == 4
+
+
+def test_existing_files_are_indexed_oldest_first(tmp_path):
+    old = tmp_path / "old.wav"
+    new = tmp_path / "new.wav"
+    old.write_bytes(b"x" * 6)
+    new.write_bytes(b"x" * 6)
+    os.utime(old, (1_000, 1_000))
+    os.utime(new, (2_000, 2_000))
+    (tmp_path / "partial.tmp").write_bytes(b"x")
+    
+    cache = TTSCache(cache_dir=tmp_path, max_disk_bytes=10)
+    
+    assert _files(tmp_path) == ["new.wav"]
+    assert cache.get_stats()["disk_bytes"] == 6
+
+
+def test_missing_file_is_a_miss(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path, max_entries=1)
+    cache.put("voice", "en", "one", b"1")
+    cache.put("voice", "en", "two", b"2")
+    (tmp_path / f"{cache.make_key('voice', 'en', 'one')}.wav").unlink()
+    
+    assert cache.get("voice", "en", "one") is None
+    assert cache.get_stats()["disk_entries"] == 1
+
+
+def test_long_text_is_not_cached(tmp_path):
+    cache = TTSCache(cache_dir=tmp_path)
+    cache.put("voice", "en", "x" * 501, b"audio")
+    
+    assert cache.get("voice", "en", "x" * 501) is None
+    assert _files(tmp_path) == []